@@ -0,0 +1,194 @@
+import math
+import random
+import time
+
+from layout import (
+    bbox, feasible_attach_pos, get_scorer, normalize_to_origin,
+    touches, type_pair_score, zone_pair_score,
+)
+from room import as_rooms
+from spatial import build_grid
+
+SIDES = ("right", "bottom", "left", "top")
+
+
+def temperature(i, iterations, t_start, t_end, schedule="geometric"):
+    """
+    Temperature at step i of `iterations`.
+      - "geometric": t_start * (t_end / t_start) ** progress
+      - "linear":    straight line from t_start to t_end
+    `schedule` may also be a callable (i, iterations) -> temperature.
+    """
+    if callable(schedule):
+        return schedule(i, iterations)
+    progress = i / max(1, iterations - 1)
+    if schedule == "geometric":
+        return t_start * (t_end / t_start) ** progress
+    if schedule == "linear":
+        return t_start + (t_end - t_start) * progress
+    raise ValueError("bad schedule")
+
+
+def pair_weight(a, b):
+    return type_pair_score(a.type, b.type) + zone_pair_score(a.zone, b.zone)
+
+
+def room_contacts(room, index, skip=None):
+    """Adjacency score of `room` with every room it touches (except `skip`)."""
+    total = 0
+    for nb in index.near(room.x - 1, room.y - 1, room.w + 2, room.h + 2):
+        if nb is room or nb is skip:
+            continue
+        if touches(room, nb):
+            total += pair_weight(room, nb)
+    return total
+
+
+def side_of(room, anchor):
+    """Side of `anchor` that `room` sits on, or None if they do not touch."""
+    if not touches(room, anchor):
+        return None
+    if room.x == anchor.x + anchor.w:
+        return "right"
+    if room.x + room.w == anchor.x:
+        return "left"
+    if room.y == anchor.y + anchor.h:
+        return "bottom"
+    return "top"
+
+
+def compactness(rooms):
+    min_x, min_y, max_x, max_y = bbox(rooms)
+    return -(max_x - min_x) * (max_y - min_y)
+
+
+def propose_position(room, anchor, side, rooms, index, rng):
+    """Random overlap-free position of `room` on `side` of `anchor`, or None."""
+    others = [r for r in rooms if r is not room]
+    options = [
+        p for p in feasible_attach_pos(room, anchor, side, others, index=index)
+        if p != (room.x, room.y)
+    ]
+    # feasible_attach_pos assumes integer coordinates; corridor trimming
+    # can leave half units, so re-check every proposal exactly
+    rng.shuffle(options)
+    for x, y in options:
+        if index.fits(x, y, room.w, room.h):
+            return x, y
+    return None
+
+
+def refine_layout(rooms, iterations=2000, t_start=100.0, t_end=1.0,
+                  schedule="geometric", moves=("slide", "reattach", "swap"),
+                  rng=None, deadline=None, clock=time.monotonic):
+    """
+    Simulated-annealing refinement of a finished layout (as returned by
+    generate_layout). Every move keeps the layout overlap-free:
+      - slide:    move a room along the wall of a room it touches
+      - reattach: move a room to another anchor room / side
+      - swap:     exchange two rooms of the same size but different type/zone
+    Circulation rooms (already trimmed to their neighbours) never move.
+
+    The objective is score_layout; single-room moves are scored
+    incrementally (contact change of the moved room + new bbox).
+    If `deadline` (a `clock()` value) is given, annealing stops there even
+    if iterations remain.
+    Returns (best_rooms, best_score); the input list is not modified.
+    With no usable move (e.g. only "swap" and no swappable rooms) the
+    layout comes back unchanged. ValueError if t_start or t_end is not > 0.
+    """
+    if t_start <= 0 or t_end <= 0:
+        raise ValueError("bad temperature: t_start and t_end must be > 0")
+    rng = rng or random
+    rooms = [r.copy() for r in as_rooms(rooms)]
+    score = get_scorer("python")
+    cur = best = score(rooms)
+    best_pos = [(r.x, r.y) for r in rooms]
+
+    movable = [r for r in rooms if r.zone != "circulation"]
+    if not movable or iterations <= 0:
+        return rooms, cur
+
+    same_size = {}
+    for r in movable:
+        same_size.setdefault((r.w, r.h), []).append(r)
+    swap_groups = [
+        g for g in same_size.values()
+        if len({(r.type, r.zone) for r in g}) > 1
+    ]
+    moves = [m for m in moves if m != "swap" or swap_groups]
+    if not moves:
+        return rooms, cur
+
+    index = build_grid(rooms)
+    area_now = compactness(rooms)
+
+    for i in range(iterations):
+        if deadline is not None and i % 64 == 0 and clock() >= deadline:
+            break
+        T = temperature(i, iterations, t_start, t_end, schedule)
+        move = rng.choice(moves)
+
+        if move == "swap":
+            group = rng.choice(swap_groups)
+            a, b = rng.sample(group, 2)
+            if (a.type, a.zone) == (b.type, b.zone):
+                continue
+            before = room_contacts(a, index, skip=b) + room_contacts(b, index, skip=a)
+            index.remove(a)
+            index.remove(b)
+            a.x, a.y, b.x, b.y = b.x, b.y, a.x, a.y
+            index.add(a)
+            index.add(b)
+            delta = room_contacts(a, index, skip=b) + room_contacts(b, index, skip=a) - before
+
+            if delta >= 0 or rng.random() < math.exp(delta / T):
+                cur += delta
+            else:
+                index.remove(a)
+                index.remove(b)
+                a.x, a.y, b.x, b.y = b.x, b.y, a.x, a.y
+                index.add(a)
+                index.add(b)
+        else:
+            room = rng.choice(movable)
+            if move == "slide":
+                anchors = [nb for nb in rooms if nb is not room and touches(room, nb)]
+                if not anchors:
+                    continue
+                anchor = rng.choice(anchors)
+                side = side_of(room, anchor)
+            else:
+                anchor = rng.choice([r for r in rooms if r is not room])
+                side = rng.choice(SIDES)
+
+            before = room_contacts(room, index)
+            old = room.x, room.y
+            index.remove(room)
+            pos = propose_position(room, anchor, side, rooms, index, rng)
+            if pos is None:
+                index.add(room)
+                continue
+
+            room.x, room.y = pos
+            index.add(room)
+            area_new = compactness(rooms)
+            delta = room_contacts(room, index) - before + area_new - area_now
+
+            if delta >= 0 or rng.random() < math.exp(delta / T):
+                cur += delta
+                area_now = area_new
+            else:
+                index.remove(room)
+                room.x, room.y = old
+                index.add(room)
+
+        if cur > best:
+            best = cur
+            best_pos = [(r.x, r.y) for r in rooms]
+
+    for r, (x, y) in zip(rooms, best_pos):
+        r.x, r.y = x, y
+    normalize_to_origin(rooms)
+    # full rescore so the returned value never carries incremental drift
+    return rooms, score(rooms)
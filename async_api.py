@@ -0,0 +1,174 @@
+"""
+asyncio front end: run the layout search and rendering in an executor so
+the event loop stays free.
+
+    result = await generate_blueprint("3 bedroom house", seed=1)
+    async for chunk in stream_blueprint(prompt, executor=pool):
+        await send(chunk)
+
+Attempts are submitted one seeded_attempt at a time (at most
+`concurrency` in flight), so cancelling the awaiting task stops every
+attempt that has not started yet. With the same seed the layout is the
+same as generate_layout(seeds=...) gives.
+
+stream_blueprint renders with the stream backend in a thread of the
+loop's default executor and yields chunks as SvgStream writes them, so
+the first bytes go out before the drawing is finished.
+"""
+import asyncio
+import random
+from functools import partial
+
+from layout import seeded_attempt
+from parser import as_requirements
+from render_svg import draw_blueprint
+from templates import get_template
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def generate_layout_async(template_rooms, attempts=20, seeds=None, executor=None,
+                                concurrency=1, backend="grid", scorer="python",
+                                candidates="slide"):
+    """
+    Async generate_layout: runs each attempt through
+    loop.run_in_executor (executor=None uses the loop's default thread
+    pool; a ProcessPoolExecutor also works). Returns the best rooms.
+    """
+    _, rooms = await _best_attempt(template_rooms, attempts, seeds, executor, concurrency,
+                                   backend, scorer, candidates)
+    return rooms
+
+
+async def _best_attempt(template_rooms, attempts, seeds, executor, concurrency,
+                        backend="grid", scorer="python", candidates="slide"):
+    """(score, rooms) of the best seeded_attempt, as scored in the worker."""
+    loop = asyncio.get_running_loop()
+    if seeds is None:
+        seeds = [random.randrange(2**32) for _ in range(attempts)]
+    seeds = list(seeds)
+    run = partial(seeded_attempt, template_rooms, backend=backend, scorer=scorer,
+                  candidates=candidates)
+
+    results = [None] * len(seeds)
+    pending = {}  # future -> attempt index
+    next_i = 0
+    try:
+        while next_i < len(seeds) or pending:
+            while next_i < len(seeds) and len(pending) < max(1, concurrency):
+                pending[loop.run_in_executor(executor, run, seeds[next_i])] = next_i
+                next_i += 1
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                results[pending.pop(fut)] = fut.result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+    # same reduce as generate_layout: best score, ties to the earliest seed
+    best_score = best_rooms = None
+    for s, placed in results:
+        if best_score is None or s > best_score:
+            best_score, best_rooms = s, placed
+    return best_score, best_rooms
+
+
+async def render_async(rooms, executor=None, **render_options):
+    """draw_blueprint in the executor; returns the SVG bytes."""
+    loop = asyncio.get_running_loop()
+    render_options.setdefault("backend", "stream")
+    return await loop.run_in_executor(
+        executor, partial(draw_blueprint, rooms, None, **render_options)
+    )
+
+
+async def generate_blueprint(prompt_or_spec, attempts=20, seed=None, executor=None,
+                             concurrency=1, **render_options):
+    """
+    Prompt string or requirements dict -> {"requirements", "rooms",
+    "score", "svg" (bytes)}, without blocking the event loop.
+    render_options go to draw_blueprint (compact, symbols, ...).
+    """
+    req = as_requirements(prompt_or_spec)
+    score, rooms = await _search(req, attempts, seed, executor, concurrency)
+    svg = await render_async(rooms, executor=executor, **render_options)
+    return {
+        "requirements": req,
+        "rooms": rooms,
+        "score": score,
+        "svg": svg,
+    }
+
+
+async def _search(req, attempts, seed, executor, concurrency):
+    template_rooms = get_template(req["building_type"], req)
+    seeds = None
+    if seed is not None:
+        rng = random.Random(seed)
+        seeds = [rng.randrange(2**32) for _ in range(attempts)]
+    return await _best_attempt(template_rooms, attempts, seeds, executor, concurrency)
+
+
+class _ChunkWriter:
+    """
+    Text file object for SvgStream in a worker thread: buffers the
+    UTF-8 bytes and hands each `chunk_size` piece to an asyncio.Queue on
+    `loop`. close() sends the rest and then None.
+    """
+
+    def __init__(self, loop, queue, chunk_size):
+        self.loop = loop
+        self.queue = queue
+        self.chunk_size = chunk_size
+        self.buf = bytearray()
+
+    def _put(self, item):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+    def write(self, text):
+        self.buf += text.encode("utf-8")
+        while len(self.buf) >= self.chunk_size:
+            self._put(bytes(self.buf[:self.chunk_size]))
+            del self.buf[:self.chunk_size]
+        return len(text)
+
+    def close(self):
+        if self.buf:
+            self._put(bytes(self.buf))
+            self.buf.clear()
+        self._put(None)
+
+
+def _render_into(rooms, writer, render_options):
+    try:
+        draw_blueprint(rooms, writer, **render_options)
+    finally:
+        writer.close()
+
+
+async def stream_blueprint(prompt_or_spec, chunk_size=CHUNK_SIZE, attempts=20, seed=None,
+                           executor=None, concurrency=1, **render_options):
+    """
+    Async generator over the SVG bytes of generate_blueprint, in
+    `chunk_size` pieces, yielded while the stream backend is still
+    drawing. The search runs in `executor`; rendering runs in a thread
+    of the loop's default executor, since the chunks have to reach this
+    process.
+    """
+    if chunk_size < 1:
+        raise ValueError("bad chunk_size")
+    req = as_requirements(prompt_or_spec)
+    _, rooms = await _search(req, attempts, seed, executor, concurrency)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    render_options.setdefault("backend", "stream")
+    writer = _ChunkWriter(loop, queue, chunk_size)
+    render = loop.run_in_executor(None, _render_into, rooms, writer, render_options)
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            break
+        yield chunk
+    # re-raises a rendering error after the chunks written before it
+    await render
@@ -0,0 +1,171 @@
+import json
+import os
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from parser import parse_text
+from templates import get_template
+from layout import generate_layout
+from render_svg import draw_blueprint
+
+
+def read_jobs(path):
+    """
+    Stream jobs from a JSONL file, one prompt per line.
+    A line is either a JSON string or an object with a "prompt" key and
+    optional "id", "seed" and "attempts". Blank lines are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                yield {"id": str(lineno), "error": f"bad json: {e}"}
+                continue
+            if isinstance(job, str):
+                job = {"prompt": job}
+            if not isinstance(job, dict) or not isinstance(job.get("prompt"), str):
+                yield {"id": str(lineno), "error": "missing prompt"}
+                continue
+            job.setdefault("id", str(lineno))
+            yield job
+
+
+def safe_filename(job_id):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(job_id)) or "_"
+
+
+def is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+
+def build_blueprint(job, out_dir, attempts=20):
+    """
+    Run one prompt through parse -> template -> layout -> render and
+    return a result record. Errors are returned, not raised, so one bad
+    prompt never stops the batch.
+    """
+    result = {"id": job.get("id"), "prompt": job.get("prompt")}
+    if "error" in job:
+        result["error"] = job["error"]
+        return result
+
+    try:
+        n = job.get("attempts", attempts)
+        if not is_int(n) or n < 1:
+            raise ValueError("bad attempts: need an integer >= 1")
+        if job.get("seed") is not None and not is_int(job["seed"]):
+            raise ValueError("bad seed: need an integer")
+
+        req = parse_text(job["prompt"])
+        template_rooms = get_template(req["building_type"], req)
+
+        if job.get("seed") is not None:
+            rng = random.Random(job["seed"])
+            rooms = generate_layout(req, template_rooms, seeds=[rng.randrange(2**32) for _ in range(n)])
+        else:
+            rooms = generate_layout(req, template_rooms, attempts=n)
+
+        filename = os.path.join(out_dir, safe_filename(job["id"]) + ".svg")
+        draw_blueprint(rooms, filename=filename)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result["svg"] = filename
+    result["rooms"] = len(rooms)
+    return result
+
+
+def run_batch(jobs_path, out_dir, results_path=None, workers=None, attempts=20, max_pending=None):
+    """
+    Stream a JSONL file of prompts through the generator.
+
+    Each prompt runs all stages inside one worker process, so different
+    prompts are parsed, laid out and rendered at the same time. At most
+    `max_pending` prompts (default 2 * workers) are in flight, so memory
+    stays flat whatever the input size. Result records are appended to
+    `results_path` (default <out_dir>/results.jsonl) as soon as each prompt
+    finishes, in completion order.
+
+    A job whose id names the same output file as an earlier job is
+    rejected with an error record. If a worker process dies, the jobs
+    in flight get error records and the rest run in a fresh pool.
+
+    workers=0 runs everything in this process (useful for debugging).
+    Returns (ok_count, error_count).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = results_path or os.path.join(out_dir, "results.jsonl")
+    jobs = unique_jobs(read_jobs(jobs_path))
+    ok = failed = 0
+
+    with open(results_path, "w", encoding="utf-8") as out:
+        def emit(result):
+            nonlocal ok, failed
+            if "error" in result:
+                failed += 1
+            else:
+                ok += 1
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+        if workers == 0:
+            for job in jobs:
+                emit(build_blueprint(job, out_dir, attempts))
+            return ok, failed
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or 2 * workers
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        pending = {}  # future -> (job, pool it was submitted to)
+
+        def collect(done):
+            nonlocal pool
+            for fut in done:
+                job, job_pool = pending.pop(fut)
+                try:
+                    emit(fut.result())
+                except BrokenProcessPool as e:
+                    emit({"id": job.get("id"), "prompt": job.get("prompt"),
+                          "error": f"BrokenProcessPool: {e}"})
+                    # the other jobs of a broken pool fail the same way
+                    if job_pool is pool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = ProcessPoolExecutor(max_workers=workers)
+
+        try:
+            for job in jobs:
+                if "error" in job:
+                    emit(build_blueprint(job, out_dir, attempts))
+                    continue
+                pending[pool.submit(build_blueprint, job, out_dir, attempts)] = job, pool
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    return ok, failed
+
+
+def unique_jobs(jobs):
+    """Pass jobs through, turning a repeated output name into an error job."""
+    seen = set()
+    for job in jobs:
+        if "error" not in job:
+            name = safe_filename(job["id"])
+            if name in seen:
+                job = {"id": job["id"], "prompt": job.get("prompt"),
+                       "error": f"duplicate id: {job['id']!r} (output {name}.svg)"}
+            seen.add(name)
+        yield job
@@ -0,0 +1,71 @@
+"""
+Cold-start time of the CLI: wall time of fresh `python main.py ...`
+processes, per mode, plus which heavy modules each mode imported.
+
+    python benchmarks/cold_start.py --runs 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "2 bedroom house with 2 bathrooms and a kitchen"
+
+HEAVY = ["layout", "render_svg", "svgwrite", "numpy", "concurrent.futures.process"]
+
+MODES = {
+    "bare interpreter": ["-c", "pass"],
+    "--help": ["main.py", "--help"],
+    "--parse-only": ["main.py", "--parse-only", PROMPT],
+    "--json": ["main.py", "--json", "--attempts", "1", PROMPT],
+    "svg": ["main.py", "--attempts", "1", PROMPT],
+    "svg x10 prompts": ["main.py", "--attempts", "1"] + [PROMPT] * 10,
+}
+
+PROBE = (
+    "import runpy, sys\n"
+    "sys.argv = sys.argv[1:]\n"
+    "try:\n"
+    "    runpy.run_path('main.py', run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print('MODULES', ' '.join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)\n"
+)
+
+
+def run(argv, cwd, out_dir):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable] + argv + (["--out-dir", out_dir] if argv[0] == "main.py" else []),
+                   cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def heavy_imports(argv, cwd, out_dir):
+    if argv[0] != "main.py":
+        return "-"
+    probe = PROBE.format(heavy=HEAVY)
+    proc = subprocess.run([sys.executable, "-c", probe] + argv + ["--out-dir", out_dir],
+                          cwd=cwd, capture_output=True, text=True, check=True)
+    line = [l for l in proc.stderr.splitlines() if l.startswith("MODULES")][-1]
+    return line[len("MODULES"):].strip() or "none"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        print(f"{'mode':<18} {'median ms':>10} {'min ms':>8}  heavy modules loaded")
+        for name, argv in MODES.items():
+            times = [run(argv, ROOT, out_dir) for _ in range(args.runs)]
+            print(f"{name:<18} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f}  "
+                  f"{heavy_imports(argv, ROOT, out_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Regression check for the "same output" guarantees of the fast paths, on
+seeded plans:
+
+  - score_layout, score_layout_np and score_layout_grid give equal scores
+  - the same seeds give the same layout serially, with pruning, with the
+    raster backend and across a process pool
+  - those layouts still hash to LAYOUT_DIGEST (layouts did not drift)
+  - the svgwrite and stream SVG backends write identical bytes
+
+    python benchmarks/equivalence.py
+    python benchmarks/equivalence.py --print-digest   # after an intended change
+
+Exits with status 1 on any mismatch. Checks that need numpy or svgwrite
+are skipped (and reported) when those are not installed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from layout import generate_layout, score_layout, score_layout_grid
+from parser import parse_text
+from render_svg import draw_blueprint
+from templates import get_template
+
+PROMPTS = [
+    "2 bedroom house with 2 bathrooms and a kitchen",
+    "restaurant with kitchen and 3 bathrooms",
+    "6 bedroom house with 4 bathrooms",
+    "cafe with 2 bathrooms",
+]
+SEEDS = [list(range(s, s + 8)) for s in (0, 100, 200)]
+SVG_OPTIONS = [
+    {},
+    {"compact": True},
+    {"symbols": True},
+    {"compact": True, "symbols": True, "precision": 2},
+]
+
+# sha256 over every serial layout (see layouts_digest); update with
+# --print-digest only when a change is meant to alter layouts
+LAYOUT_DIGEST = "d37c8358e7feaea8d53e996c3fbacdbe1135933b45dbf91a2f4abba844c0d76e"
+
+
+def plans():
+    for prompt in PROMPTS:
+        req = parse_text(prompt)
+        yield prompt, req, get_template(req["building_type"], req)
+
+
+def same(a, b):
+    return [r.to_dict() for r in a] == [r.to_dict() for r in b]
+
+
+def layouts_digest(layouts):
+    blob = json.dumps([[r.to_dict() for r in rooms] for rooms in layouts], sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def optional(module):
+    try:
+        __import__(module)
+    except ImportError:
+        print(f"skip: {module} is not installed")
+        return False
+    return True
+
+
+def run_checks(workers=2):
+    """Yield (check name, ok, detail) for every comparison."""
+    has_numpy = optional("numpy")
+    has_svgwrite = optional("svgwrite")
+    if has_numpy:
+        from scoring import score_layout_np
+
+    serial = []
+    for prompt, req, template_rooms in plans():
+        for seeds in SEEDS:
+            name = f"{prompt!r} seeds {seeds[0]}.."
+            rooms = generate_layout(req, template_rooms, seeds=seeds)
+            serial.append(rooms)
+
+            s = score_layout(rooms)
+            yield f"score grid {name}", score_layout_grid(rooms) == s, s
+            if has_numpy:
+                yield f"score numpy {name}", score_layout_np(rooms) == s, s
+
+            yield f"layout prune {name}", same(
+                generate_layout(req, template_rooms, seeds=seeds, prune=True), rooms), ""
+            if has_numpy:
+                yield f"layout raster {name}", same(
+                    generate_layout(req, template_rooms, seeds=seeds, backend="raster"), rooms), ""
+            yield f"layout pool {name}", same(
+                generate_layout(req, template_rooms, seeds=seeds, workers=workers), rooms), ""
+
+            if has_svgwrite and seeds is SEEDS[0]:
+                for options in SVG_OPTIONS:
+                    a = draw_blueprint(rooms, backend="svgwrite", **options)
+                    b = draw_blueprint(rooms, backend="stream", **options)
+                    yield f"svg bytes {options} {name}", a == b, f"{len(a)} vs {len(b)} bytes"
+
+    digest = layouts_digest(serial)
+    yield "layout digest", digest == LAYOUT_DIGEST, digest
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--workers", type=int, default=2, help="processes for the pool check")
+    ap.add_argument("--print-digest", action="store_true",
+                    help="print the current layout digest (for LAYOUT_DIGEST) and exit")
+    args = ap.parse_args()
+
+    if args.print_digest:
+        print(layouts_digest(generate_layout(req, template_rooms, seeds=seeds)
+                             for _, req, template_rooms in plans() for seeds in SEEDS))
+        return
+
+    failed = 0
+    checks = 0
+    for name, ok, detail in run_checks(args.workers):
+        checks += 1
+        if not ok:
+            failed += 1
+            print("MISMATCH", name, detail)
+    if failed:
+        print(f"{failed} of {checks} checks failed")
+        sys.exit(1)
+    print(f"all {checks} checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Layout time vs. room count, from 10 to 2000 rooms.
+
+    python benchmarks/layout_scaling.py
+    python benchmarks/layout_scaling.py --sizes 10 100 1000 --search-max 100
+
+Each size is a seeded synthetic house (2 bedrooms per bathroom plus the
+living/kitchen/dining/hall core). Large-plan mode runs at every size; the
+regular attempt search only up to --search-max rooms, since it grows
+quadratically.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import get_template
+from layout import generate_layout, score_layout_grid
+from large import large_layout
+
+DEFAULT_SIZES = [10, 25, 50, 100, 250, 500, 1000, 2000]
+
+
+def synthetic_requirements(n_rooms):
+    extra = max(0, n_rooms - 4)  # living, kitchen, dining, hall
+    baths = max(1, extra // 3)
+    return {"bedroom": max(1, extra - baths), "bathroom": baths, "kitchen": 1}
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--search-max", type=int, default=100)
+    ap.add_argument("--attempts", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'rooms':>6} {'large ms':>10} {'us/room':>8} {'large score':>12} {'search ms':>10} {'search score':>13}")
+    for n in args.sizes:
+        req = synthetic_requirements(n)
+        template_rooms = get_template("house", req)
+
+        t_large, rooms = timed(lambda: large_layout(req, template_rooms), args.repeat)
+        large_score = score_layout_grid(rooms)
+
+        search_ms = search_score = "-"
+        if n <= args.search_max:
+            seeds = list(range(args.attempts))
+            t_search, rooms = timed(lambda: generate_layout(req, template_rooms, seeds=seeds), 1)
+            search_ms = f"{t_search * 1000:.1f}"
+            search_score = score_layout_grid(rooms)
+
+        print(f"{len(template_rooms):>6} {t_large * 1000:>10.2f} {t_large / len(template_rooms) * 1e6:>8.2f} "
+              f"{large_score:>12} {search_ms:>10} {search_score:>13}")
+
+
+if __name__ == "__main__":
+    main()
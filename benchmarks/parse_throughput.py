@@ -0,0 +1,57 @@
+"""
+Parser throughput over a seeded synthetic prompt corpus.
+
+    python benchmarks/parse_throughput.py --prompts 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_many, parse_text
+
+NUMBERS = ["a", "one", "two", "three", "four", "twenty-one", "2", "3", "5", "12"]
+BUILDINGS = ["house", "home", "restaurant", "cafe", "bistro", "family home"]
+ROOMS = ["bedroom", "bedrooms", "bathroom", "bathrooms", "kitchen"]
+FILLER = ["with", "and", "a", "cozy", "large", "in the back", "near the entrance", "open plan"]
+
+
+def synthetic_prompts(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        parts = [rng.choice(FILLER), rng.choice(BUILDINGS)]
+        for _ in range(rng.randint(1, 4)):
+            parts += [rng.choice(FILLER), rng.choice(NUMBERS), rng.choice(ROOMS)]
+        if rng.random() < 0.3:
+            parts += ["for", str(rng.randint(10, 200)), "seats"]
+        yield " ".join(parts)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--prompts", type=int, default=100000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    corpus = list(synthetic_prompts(args.prompts, args.seed))
+    chars = sum(len(p) for p in corpus)
+
+    t0 = time.perf_counter()
+    parse_many(corpus)
+    bulk = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for p in corpus:
+        parse_text(p)
+    single = time.perf_counter() - t0
+
+    print(f"{len(corpus)} prompts, {chars / 1e6:.1f} MB of text")
+    print(f"parse_many: {len(corpus) / bulk:,.0f} prompts/s ({chars / bulk / 1e6:.1f} MB/s)")
+    print(f"parse_text: {len(corpus) / single:,.0f} prompts/s")
+
+
+if __name__ == "__main__":
+    main()
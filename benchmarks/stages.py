@@ -0,0 +1,186 @@
+"""
+Per-stage benchmarks over seeded synthetic plans of increasing size.
+
+    python benchmarks/stages.py
+    python benchmarks/stages.py --sizes 10 50 --stages score_layout draw_blueprint
+    python benchmarks/stages.py --save benchmarks/baseline.json
+    python benchmarks/stages.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+Every stage is timed on its own (parse_text, get_template,
+try_place_adjacent, no_overlap, score_layout, generate_layout,
+draw_blueprint) and reported as ops/s, p50 / p99 latency and the peak
+memory traced during one extra, separately measured call.
+
+--save writes the results as JSON. --baseline compares against such a
+file and exits with status 1 if any stage's p50 latency or peak memory
+grew by more than --tolerance (a fraction, ignoring tiny absolute
+changes, see MIN_DELTA). Baselines are only
+meaningful on the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constraints import no_overlap
+from layout import fallback_pack, generate_layout, score_layout, try_place_adjacent
+from parser import parse_text
+from render_svg import draw_blueprint
+from spatial import build_grid
+from templates import get_template
+
+DEFAULT_SIZES = [10, 50, 150]
+# changes smaller than this are timer / allocator noise, never regressions
+MIN_DELTA = {"p50_ms": 0.05, "peak_kib": 16}
+STAGES = [
+    "parse_text", "get_template", "try_place_adjacent", "no_overlap",
+    "score_layout", "generate_layout", "draw_blueprint",
+]
+
+
+def synthetic_prompt(n_rooms, seed=0):
+    """House prompt with about `n_rooms` rooms (living/kitchen/dining/hall + 2:1 bed/bath)."""
+    rng = random.Random(seed * 100003 + n_rooms)
+    extra = max(2, n_rooms - 4 + rng.randint(-1, 1))
+    baths = max(1, extra // 3)
+    return f"{extra - baths} bedroom house with {baths} bathrooms and a kitchen"
+
+
+def placed_prefix(template_rooms, seed):
+    """
+    Placement state just before the last room is placed (as inside
+    layout_attempt, before corridor trimming): (placed, index, last room).
+    """
+    rooms = [r.copy() for r in template_rooms]
+    rng = random.Random(seed)
+    rooms[0].x, rooms[0].y = 0, 0
+    placed = [rooms[0]]
+    index = build_grid(placed)
+    for room in rooms[1:-1]:
+        if not try_place_adjacent(placed, room, index=index, rng=rng):
+            fallback_pack(placed, room, gap=0, index=index)
+        placed.append(room)
+        index.add(room)
+    return placed, index, rooms[-1]
+
+
+def stage_ops(n_rooms, seed, attempts):
+    """
+    stage name -> zero-argument callable, for one synthetic plan.
+    Inputs each stage needs (templates, a finished layout) are built here,
+    outside the timed calls.
+    """
+    prompt = synthetic_prompt(n_rooms, seed)
+    req = parse_text(prompt)
+    template_rooms = get_template(req["building_type"], req)
+    seeds = [seed * 1000 + i for i in range(attempts)]
+    rooms = generate_layout(req, template_rooms, seeds=seeds)
+
+    placed, index, last = placed_prefix(template_rooms, seed)
+
+    return {
+        "parse_text": lambda: parse_text(prompt),
+        "get_template": lambda: get_template(req["building_type"], req),
+        "try_place_adjacent": lambda: try_place_adjacent(
+            placed, last.copy(), index=index, rng=random.Random(seed)),
+        "no_overlap": lambda: no_overlap(rooms),
+        "score_layout": lambda: score_layout(rooms),
+        "generate_layout": lambda: generate_layout(req, template_rooms, seeds=seeds),
+        "draw_blueprint": lambda: draw_blueprint(rooms),
+    }, len(template_rooms)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    k = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def measure(fn, min_time, min_runs, max_runs):
+    fn()  # warm-up (imports, caches)
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_runs and (len(times) < min_runs or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "runs": len(times),
+        "ops": len(times) / sum(times),
+        "p50_ms": percentile(times, 50) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing regressions of `results` against `baseline`."""
+    regressions = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, min_delta in MIN_DELTA.items():
+            grew = cur[metric] - base[metric]
+            if grew > min_delta and grew > base[metric] * tolerance:
+                regressions.append(
+                    f"{key} {metric}: {base[metric]:.3f} -> {cur[metric]:.3f} "
+                    f"(+{(cur[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--attempts", type=int, default=5, help="attempts per generate_layout call")
+    ap.add_argument("--min-time", type=float, default=0.5, help="seconds per stage and size")
+    ap.add_argument("--min-runs", type=int, default=5)
+    ap.add_argument("--max-runs", type=int, default=10000)
+    ap.add_argument("--save", help="write results as a JSON baseline")
+    ap.add_argument("--baseline", help="compare against a saved baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args()
+
+    results = {}
+    print(f"{'stage':<20} {'rooms':>6} {'runs':>6} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>9}")
+    for size in args.sizes:
+        ops, n_rooms = stage_ops(size, args.seed, args.attempts)
+        for stage in args.stages:
+            r = measure(ops[stage], args.min_time, args.min_runs, args.max_runs)
+            results[f"{stage}@{size}"] = dict(r, rooms=n_rooms)
+            print(f"{stage:<20} {n_rooms:>6} {r['runs']:>6} {r['ops']:>10,.1f} "
+                  f"{r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['peak_kib']:>9.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"saved {len(results)} results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+from collections import OrderedDict
+
+from constraints import Constraint
+from parser import parse_text
+from templates import get_template
+from layout import SCORING_VERSION, generate_layout
+from room import Room, as_rooms
+
+# generate_layout options that only change how the search is executed
+# or observed, not which layout comes out
+EXECUTION_ONLY = ("scorer", "workers", "executor", "stats")
+
+
+def key_value(value):
+    """
+    JSON form of an option value json cannot encode itself: constraints
+    by class and arguments. Anything else (an rng, a callable, ...) has no
+    stable form, so it cannot be part of a cache key: ValueError.
+    """
+    if isinstance(value, Constraint):
+        return {"constraint": type(value).__name__, "args": vars(value)}
+    raise ValueError(f"option value {value!r} cannot be part of a cache key")
+
+
+def canonical_key(requirements, template_rooms, options):
+    """
+    Stable hash of everything that decides the layout: parsed requirements,
+    template contents, attempts/seed/layout options and SCORING_VERSION.
+    Raises ValueError for option values without a stable form (key_value).
+    """
+    payload = {
+        "requirements": requirements,
+        "template": [r.to_dict() for r in as_rooms(template_rooms)],
+        "options": {k: v for k, v in options.items() if k not in EXECUTION_ONLY},
+        "scoring_version": SCORING_VERSION,
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=key_value)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def encode_rooms(rooms):
+    """One layout, or a list of layouts (generate_layout with top_k)."""
+    if rooms and isinstance(rooms[0], list):
+        data = [[r.to_dict() for r in as_rooms(layout)] for layout in rooms]
+    else:
+        data = [r.to_dict() for r in as_rooms(rooms)]
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def decode_rooms(data):
+    data = json.loads(data)
+    if data and isinstance(data[0], list):
+        return [[Room.from_dict(d) for d in layout] for layout in data]
+    return [Room.from_dict(d) for d in data]
+
+
+class LayoutCache:
+    """
+    Two-tier layout cache.
+
+    Tier 1 is an in-memory LRU holding encoded layouts, evicted by total
+    size (max_bytes). Tier 2 is an optional directory of JSON files that
+    survives restarts; disk hits are promoted into memory. The directory
+    is capped at max_disk_bytes: when a put() goes over, the least
+    recently used files (by mtime, which disk hits refresh) are deleted
+    down to 90% of the cap. Every get() returns fresh Room objects, so
+    callers may mutate them.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None,
+                 max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = directory
+        self.disk_size = 0
+        self.memory = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_size = sum(size for _, size, _ in self._disk_files())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _disk_files(self):
+        """(mtime, size, path) of every cached file in the directory."""
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another process
+                yield st.st_mtime, st.st_size, entry.path
+
+    def _evict_disk(self):
+        # other processes may share the directory: recount before deleting
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def _remember(self, key, data):
+        # caller holds the lock
+        old = self.memory.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self.memory[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.size -= len(evicted)
+
+    def get(self, key):
+        with self._lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return decode_rooms(data)
+
+        if self.directory:
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                try:
+                    os.utime(self._path(key))  # recently used: evicted last
+                except OSError:
+                    pass
+                with self._lock:
+                    self._remember(key, data)
+                    self.disk_hits += 1
+                return decode_rooms(data)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, rooms):
+        data = encode_rooms(rooms)
+        with self._lock:
+            self._remember(key, data)
+
+        if self.directory and len(data) <= self.max_disk_bytes:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write-then-rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            with self._lock:
+                self.disk_size += len(data)
+                if self.disk_size > self.max_disk_bytes:
+                    self.disk_size = self._evict_disk()
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.memory),
+            "bytes": self.size,
+            "disk_bytes": self.disk_size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+def cached_layout(text, cache, attempts=20, seed=None, **layout_options):
+    """
+    parse_text -> get_template -> generate_layout, served from `cache` when
+    the same canonical spec has been laid out before.
+    With a seed, the attempt seeds are derived from it, so a cached layout
+    is exactly what a fresh run would return.
+    """
+    req = parse_text(text)
+    template_rooms = get_template(req["building_type"], req)
+
+    options = dict(layout_options, attempts=attempts, seed=seed)
+    key = canonical_key(req, template_rooms, options)
+    rooms = cache.get(key)
+    if rooms is not None:
+        return rooms
+
+    if seed is not None:
+        rng = random.Random(seed)
+        layout_options["seeds"] = [rng.randrange(2**32) for _ in range(attempts)]
+    rooms = generate_layout(req, template_rooms, attempts=attempts, **layout_options)
+    cache.put(key, rooms)
+    return rooms
@@ -1,14 +1,283 @@
+import copy
+
+from room import as_rooms
+
 def no_overlap(rooms):
+    rooms = as_rooms(rooms)
     for i in range(len(rooms)):
         for j in range(i + 1, len(rooms)):
             a = rooms[i]
             b = rooms[j]
 
             if not (
-                a["x"] + a["w"] <= b["x"] or 
-                b["x"] + b["w"] <= a["x"] or 
-                a["y"] + a["h"] <= b["y"] or
-                b["y"] + b["h"] <= a["y"]
+                a.x + a.w <= b.x or
+                b.x + b.w <= a.x or
+                a.y + a.h <= b.y or
+                b.y + b.h <= a.y
             ):
                 return False
     return True
+
+def first_overlap(rooms, x, y, w, h):
+    """
+    Index of the first of `rooms` (a list of Room objects) that a w*h
+    rectangle at (x, y) overlaps, or -1.
+    """
+    for i, b in enumerate(rooms):
+        if not (
+            x + w <= b.x or
+            b.x + b.w <= x or
+            y + h <= b.y or
+            b.y + b.h <= y
+        ):
+            return i
+    return -1
+
+def rect_fits(rooms, x, y, w, h, stats=None):
+    """
+    True if a w*h rectangle at (x, y) overlaps none of `rooms` (a list of
+    Room objects). `stats` counts the rooms compared as "pairs_compared".
+    """
+    i = first_overlap(rooms, x, y, w, h)
+    if stats is not None:
+        stats.count("pairs_compared", len(rooms) if i < 0 else i + 1)
+    return i < 0
+
+
+def rect_touches(x, y, w, h, b):
+    """True if the w*h rectangle at (x, y) shares an edge segment with room `b`."""
+    if x + w == b.x or b.x + b.w == x:
+        return max(y, b.y) < min(y + h, b.y + b.h)
+    if y + h == b.y or b.y + b.h == y:
+        return max(x, b.x) < min(x + w, b.x + b.w)
+    return False
+
+
+# --------------------------
+# Constraint engine
+# --------------------------
+#
+# A constraint is an object with three optional methods:
+#   compile(template_rooms)          -> a compiled copy of the constraint,
+#                                       or None if it can never apply to
+#                                       these rooms
+#   admits(state, room, x, y)        -> False rejects `room` at (x, y)
+#                                       while the layout is being placed
+#   satisfied(rooms)                 -> False rejects a finished layout
+#                                       (after corridor trimming)
+# Constraint is a do-nothing base class to inherit from. An engine is
+# compiled once per request (compile_constraints) and never changes, so
+# attempts can share it across threads or processes; each attempt gets
+# its own PlacementState from engine.new_state().
+
+class Constraint:
+    def compile(self, template_rooms):
+        return copy.copy(self)
+
+    def admits(self, state, room, x, y):
+        return True
+
+    def satisfied(self, rooms):
+        return True
+
+
+class MaxFootprint(Constraint):
+    """Bounding box of the whole layout at most `width` x `height` units."""
+
+    def __init__(self, width=None, height=None):
+        self.width = width
+        self.height = height
+
+    def compile(self, template_rooms):
+        if self.width is None and self.height is None:
+            return None
+        return copy.copy(self)
+
+    def admits(self, state, room, x, y):
+        min_x, min_y, max_x, max_y = state.bbox_with(x, y, room.w, room.h)
+        if self.width is not None and max_x - min_x > self.width:
+            return False
+        if self.height is not None and max_y - min_y > self.height:
+            return False
+        return True
+
+    def satisfied(self, rooms):
+        min_x = min(r.x for r in rooms)
+        min_y = min(r.y for r in rooms)
+        max_x = max(r.x + r.w for r in rooms)
+        max_y = max(r.y + r.h for r in rooms)
+        return ((self.width is None or max_x - min_x <= self.width) and
+                (self.height is None or max_y - min_y <= self.height))
+
+
+class RequiredAdjacency(Constraint):
+    """
+    Every room of type `room_type` touches a room of type `neighbour_type`.
+    While placing, a `room_type` room must touch one of the `neighbour_type`
+    rooms placed so far (skipped for circulation neighbours, which are
+    reshaped by corridor trimming afterwards).
+    """
+
+    def __init__(self, room_type, neighbour_type):
+        self.room_type = room_type
+        self.neighbour_type = neighbour_type
+
+    def compile(self, template_rooms):
+        types = {r.type for r in template_rooms}
+        if self.room_type not in types or self.neighbour_type not in types:
+            return None
+        compiled = copy.copy(self)
+        compiled.incremental = not any(
+            r.zone == "circulation" for r in template_rooms if r.type == self.neighbour_type
+        )
+        return compiled
+
+    def admits(self, state, room, x, y):
+        if not self.incremental or room.type != self.room_type:
+            return True
+        neighbours = state.placed_by_type.get(self.neighbour_type)
+        if not neighbours:
+            return True  # none placed yet; only the final check applies
+        return any(rect_touches(x, y, room.w, room.h, b) for b in neighbours)
+
+    def satisfied(self, rooms):
+        neighbours = [r for r in rooms if r.type == self.neighbour_type]
+        return all(
+            any(rect_touches(r.x, r.y, r.w, r.h, b) for b in neighbours)
+            for r in rooms if r.type == self.room_type
+        )
+
+
+class ExteriorAccess(Constraint):
+    """
+    The entrance room (is_entrance) keeps at least one side on the outer
+    edge of the layout, so render_svg can put the front door there.
+    """
+
+    def compile(self, template_rooms):
+        if not any(r.is_entrance for r in template_rooms):
+            return None
+        return copy.copy(self)
+
+    def admits(self, state, room, x, y):
+        entrance = state.entrance
+        if entrance is None:
+            return True
+        if room is entrance:
+            ex, ey = x, y
+        else:
+            ex, ey = entrance.x, entrance.y
+        min_x, min_y, max_x, max_y = state.bbox_with(x, y, room.w, room.h)
+        return (ex == min_x or ey == min_y or
+                ex + entrance.w == max_x or ey + entrance.h == max_y)
+
+    def satisfied(self, rooms):
+        entrance = next((r for r in rooms if r.is_entrance), None)
+        if entrance is None:
+            return True
+        return (entrance.x == min(r.x for r in rooms) or
+                entrance.y == min(r.y for r in rooms) or
+                entrance.x + entrance.w == max(r.x + r.w for r in rooms) or
+                entrance.y + entrance.h == max(r.y + r.h for r in rooms))
+
+
+class MinCorridorClearance(Constraint):
+    """
+    Every circulation room is at least `clearance` units wide (short side)
+    and long enough (long side) to reach past a door on each neighbour.
+    Only checked on the finished layout: corridors are trimmed last.
+    """
+
+    def __init__(self, clearance=3, min_length=0):
+        self.clearance = clearance
+        self.min_length = min_length
+
+    def compile(self, template_rooms):
+        if not any(r.zone == "circulation" for r in template_rooms):
+            return None
+        return copy.copy(self)
+
+    def satisfied(self, rooms):
+        return all(
+            min(r.w, r.h) >= self.clearance and max(r.w, r.h) >= self.min_length
+            for r in rooms if r.zone == "circulation"
+        )
+
+
+class ConstraintEngine:
+    """
+    Compiled constraints for one request. Read-only once built; the
+    per-attempt bookkeeping lives in the PlacementState from new_state().
+    """
+
+    def __init__(self, constraints):
+        self.constraints = tuple(constraints)
+        self.checks = tuple(c for c in constraints
+                            if type(c).admits is not Constraint.admits)
+
+    def new_state(self):
+        return PlacementState(self.checks)
+
+    def satisfied(self, rooms):
+        return all(c.satisfied(rooms) for c in self.constraints)
+
+
+class PlacementState:
+    """
+    One attempt's view of the engine. Tracks the bounding box, the
+    entrance room and placed rooms by type so admits() stays O(1) per
+    constraint for footprint / exterior checks.
+    """
+
+    def __init__(self, checks):
+        self.checks = checks
+        self.bbox = None
+        self.entrance = None
+        self.placed_by_type = {}
+
+    def bbox_with(self, x, y, w, h):
+        """Bounding box of the placed rooms plus a w*h rectangle at (x, y)."""
+        if self.bbox is None:
+            return x, y, x + w, y + h
+        min_x, min_y, max_x, max_y = self.bbox
+        return min(min_x, x), min(min_y, y), max(max_x, x + w), max(max_y, y + h)
+
+    def admits(self, room, x, y):
+        for c in self.checks:
+            if not c.admits(self, room, x, y):
+                return False
+        return True
+
+    def place(self, room):
+        self.bbox = self.bbox_with(room.x, room.y, room.w, room.h)
+        if room.is_entrance and self.entrance is None:
+            self.entrance = room
+        self.placed_by_type.setdefault(room.type, []).append(room)
+
+
+def constraints_from_requirements(requirements):
+    """
+    Default hard constraints for a parsed request: the footprint is at most
+    total_width wide, the entrance stays on the outside, corridors keep
+    their clearance.
+    """
+    return [
+        MaxFootprint(width=requirements.get("total_width")),
+        ExteriorAccess(),
+        MinCorridorClearance(),
+    ]
+
+
+def compile_constraints(constraints, template_rooms, requirements=None):
+    """
+    Build a ConstraintEngine. `constraints` is a list of Constraint
+    objects, or "auto" for constraints_from_requirements(requirements).
+    Constraints that cannot apply to `template_rooms` are dropped.
+    Returns None if nothing is left to check.
+    """
+    if constraints == "auto":
+        constraints = constraints_from_requirements(requirements or {})
+    template_rooms = as_rooms(template_rooms)
+    compiled = [c.compile(template_rooms) for c in constraints]
+    compiled = [c for c in compiled if c is not None]
+    return ConstraintEngine(compiled) if compiled else None
@@ -0,0 +1,117 @@
+import heapq
+from collections import Counter
+
+from layout import bbox
+
+
+def transforms(rooms):
+    """
+    The 8 rotations / mirror images of a layout, each as a sorted tuple of
+    (type, x, y, w, h) relative to its bounding box.
+    """
+    min_x, min_y, max_x, max_y = bbox(rooms)
+    W, H = max_x - min_x, max_y - min_y
+    boxes = [(r.type or "", r.x - min_x, r.y - min_y, r.w, r.h) for r in rooms]
+
+    out = []
+    for swap in (False, True):
+        for flip_x in (False, True):
+            for flip_y in (False, True):
+                image = []
+                for t, x, y, w, h in boxes:
+                    if swap:
+                        x, y, w, h = y, x, h, w
+                    bw, bh = (H, W) if swap else (W, H)
+                    if flip_x:
+                        x = bw - x - w
+                    if flip_y:
+                        y = bh - y - h
+                    image.append((t, x, y, w, h))
+                out.append(tuple(sorted(image)))
+    return out
+
+
+def canonical_geometry(rooms):
+    """
+    Key that is equal for layouts that only differ by position, rotation,
+    mirroring or by swapping rooms of the same type.
+    """
+    return min(transforms(rooms))
+
+
+def difference(key, images):
+    """layout_difference for a canonical key and the transforms of another layout."""
+    n = max(len(key), len(images[0]))
+    if not n:
+        return 0.0
+    boxes = Counter(key)
+    same = max(sum((boxes & Counter(image)).values()) for image in images)
+    return 1.0 - same / n
+
+
+def layout_difference(a, b):
+    """
+    Share of rooms (0..1) that are not in the same place in both layouts,
+    after lining `b` up with `a` in the best of its 8 orientations.
+    """
+    return difference(canonical_geometry(a), transforms(b))
+
+
+class TopLayouts:
+    """
+    The k best distinct layouts seen so far, in a bounded min-heap.
+
+    A layout is kept only if no kept layout with a score at least as high
+    is within `min_difference` of it (layout_difference); kept layouts it
+    beats within that distance are dropped. Exact duplicates (same
+    canonical_geometry) are rejected before any comparison. Ties go to
+    the layout added first, as in generate_layout.
+    """
+
+    def __init__(self, k, min_difference=0.2):
+        if k < 1:
+            raise ValueError("bad top_k")
+        self.k = k
+        self.min_difference = min_difference
+        self.heap = []  # (score, -order, key, rooms)
+        self.keys = {}  # canonical key -> score
+        self.added = 0
+
+    def threshold(self):
+        """Score a new layout must beat to get in, None while not full."""
+        if len(self.heap) < self.k:
+            return None
+        return self.heap[0][0]
+
+    def add(self, score, rooms):
+        """Offer a layout. Returns True if it was kept."""
+        order = self.added
+        self.added += 1
+        full = self.threshold()
+        if full is not None and score <= full:
+            return False
+
+        images = transforms(rooms)
+        key = min(images)
+        if key in self.keys and self.keys[key] >= score:
+            return False  # exact duplicate, no need to compare
+        near = [e for e in self.heap
+                if e[2] == key or difference(e[2], images) < self.min_difference]
+        if any(e[0] >= score for e in near):
+            return False
+
+        if near:
+            self.heap = [e for e in self.heap if e not in near]
+            heapq.heapify(self.heap)
+            for e in near:
+                del self.keys[e[2]]
+        heapq.heappush(self.heap, (score, -order, key, rooms))
+        self.keys[key] = score
+        if len(self.heap) > self.k:
+            dropped = heapq.heappop(self.heap)
+            del self.keys[dropped[2]]
+        return True
+
+    def results(self):
+        """[(score, rooms)], best first."""
+        return [(e[0], e[3]) for e in sorted(self.heap, reverse=True)]
@@ -0,0 +1,152 @@
+import math
+
+from room import as_room
+
+# generate_layout(..., large_plan="auto") switches to large_layout above this
+LARGE_PLAN_ROOMS = 60
+
+
+def shelf_pack(rooms, width, x0=0, y0=0):
+    """
+    Pack rooms left to right in rows ("shelves") no wider than `width`,
+    top-aligned within each row, rows stacked downwards from (x0, y0).
+    Rooms keep their given order. Returns the y just below the last row.
+    """
+    x, y, row_h = x0, y0, 0
+    for r in rooms:
+        if x > x0 and x + r.w > x0 + width:
+            x, y, row_h = x0, y + row_h, 0
+        r.x, r.y = x, y
+        x += r.w
+        row_h = max(row_h, r.h)
+    return y + row_h
+
+
+def fill_row(rooms, start, width):
+    """Take rooms from `start` while they fit in `width`. Returns end index."""
+    used = 0
+    end = start
+    while end < len(rooms) and (end == start or used + rooms[end].w <= width):
+        used += rooms[end].w
+        end += 1
+    return end
+
+
+def extra_hall(halls, rooms, name):
+    """Clone the last hall (or a default one) as a new corridor named `name`."""
+    hall = (halls[-1] if halls else as_room({
+        "name": "Hall", "type": "hall", "zone": "circulation",
+        "connects_to": ["bedroom", "bathroom"],
+    })).copy()
+    hall.name = name
+    halls.append(hall)
+    rooms.append(hall)
+    return hall
+
+
+def large_layout(requirements, template_rooms, corridor_width=4, aspect=1.0):
+    """
+    Layout for plans with hundreds or thousands of rooms, in
+    O(n log n) time (one sort per zone, everything else linear).
+
+    Rooms are clustered by zone instead of searched one by one:
+      - the entrance room first, then service rooms, then public (and
+        unzoned) rooms are shelf-packed into the top block, so kitchens
+        sit between the entrance and the dining/living rooms
+      - private rooms go below in bands along corridors. The first
+        corridor runs right under the top block (so it meets the living
+        areas) with one row of rooms below it; later bands are
+        double-loaded: a row of rooms, a corridor strip, another row
+      - with more than one band, a vertical spine corridor along the left
+        edge joins every band corridor to the first one, so each room can
+        be reached from the entrance
+      - corridors are the template's circulation rooms, reshaped into
+        strips; extra ones are cloned from the last hall if needed
+
+    Target width is about sqrt(total area * aspect), so the plan stays
+    roughly square. Returns new Room objects with x/y set from (0, 0).
+    """
+    rooms = [as_room(r).copy() for r in template_rooms]
+    if not rooms:
+        return rooms
+
+    total_area = sum(r.w * r.h for r in rooms)
+    width = max(max(r.w for r in rooms), int(math.ceil(math.sqrt(total_area * aspect))))
+
+    entrance = [r for r in rooms if r.is_entrance][:1]
+    rest = [r for r in rooms if not entrance or r is not entrance[0]]
+    halls = [r for r in rest if r.zone == "circulation"]
+    private = [r for r in rest if r.zone == "private"]
+    service = [r for r in rest if r.zone == "service"]
+    public = [r for r in rest if r.zone not in ("private", "service", "circulation")]
+
+    # tallest first keeps shelves tight (sort is stable: template order within a height)
+    service.sort(key=lambda r: -r.h)
+    public.sort(key=lambda r: -r.h)
+    private.sort(key=lambda r: -r.h)
+
+    y = shelf_pack(entrance + service + public, width)
+
+    if not private:
+        # no bands: keep corridors as a strip under the top block
+        x = 0
+        for hall in halls:
+            hall.x, hall.y = x, y
+            x += hall.w
+        return rooms
+
+    band_width = width
+    i = 0
+    band = 0
+    while i < len(private):
+        top_end = fill_row(private, i, band_width) if band else i
+        bottom_end = fill_row(private, top_end, band_width)
+        top_row = private[i:top_end]
+        bottom_row = private[top_end:bottom_end]
+        i = bottom_end
+
+        top_h = max((r.h for r in top_row), default=0)
+        corridor_y = y + top_h
+
+        x = 0
+        for r in top_row:
+            r.x, r.y = x, corridor_y - r.h
+            x += r.w
+        row_w = x
+        x = 0
+        for r in bottom_row:
+            r.x, r.y = x, corridor_y + corridor_width
+            x += r.w
+        row_w = max(row_w, x)
+
+        if band < len(halls):
+            hall = halls[band]
+        else:
+            hall = extra_hall(halls, rooms, f"Hall {band + 1}")
+        hall.x, hall.y = 0, corridor_y
+        hall.w, hall.h = row_w, corridor_width
+
+        bottom_h = max((r.h for r in bottom_row), default=0)
+        y = corridor_y + corridor_width + bottom_h
+        band += 1
+
+    if band > 1:
+        # spine: the band rooms move right to make room for it; the first
+        # corridor widens to run over it, under the top block
+        for r in private + halls[1:band]:
+            r.x += corridor_width
+        halls[0].w += corridor_width
+        spine = extra_hall(halls, rooms, "Spine")
+        halls.remove(spine)  # not a band corridor
+        spine.x, spine.y = 0, halls[0].y + corridor_width
+        spine.w = corridor_width
+        spine.h = halls[band - 1].y + corridor_width - spine.y
+
+    # template halls that no band needed extend the first corridor
+    x = halls[0].x + halls[0].w
+    for hall in halls[band:]:
+        hall.x, hall.y = x, halls[0].y
+        hall.w, hall.h = corridor_width, corridor_width
+        x += corridor_width
+
+    return rooms
@@ -1,14 +1,18 @@
-from constraints import no_overlap
+from constraints import rect_fits
+from room import as_room, as_rooms
+from spatial import SpatialGrid, build_grid
+from functools import partial
 import random
+import time
 
 def touches(a, b):
     # axis-aligned rectangle touch check (shared edge overlap)
     # right/left
-    if a["x"] + a["w"] == b["x"] or b["x"] + b["w"] == a["x"]:
-        return overlap_1d(a["y"], a["h"], b["y"], b["h"])
+    if a.x + a.w == b.x or b.x + b.w == a.x:
+        return overlap_1d(a.y, a.h, b.y, b.h)
     # top/bottom
-    if a["y"] + a["h"] == b["y"] or b["y"] + b["h"] == a["y"]:
-        return overlap_1d(a["x"], a["w"], b["x"], b["w"])
+    if a.y + a.h == b.y or b.y + b.h == a.y:
+        return overlap_1d(a.x, a.w, b.x, b.w)
     return False
 
 def overlap_1d(a, alen, b, blen):
@@ -25,13 +29,13 @@ def attach(room_to_place, anchor, side):
         - top:    room is placed above anchor
     """
     if side == "right":
-        return anchor["x"] + anchor["w"], anchor["y"]
+        return anchor.x + anchor.w, anchor.y
     if side == "left":
-        return anchor["x"] - room_to_place["w"], anchor["y"]
+        return anchor.x - room_to_place.w, anchor.y
     if side == "bottom":
-        return anchor["x"], anchor["y"] + anchor["h"]
+        return anchor.x, anchor.y + anchor.h
     if side == "top":
-        return anchor["x"], anchor["y"] - room_to_place["h"]
+        return anchor.x, anchor.y - room_to_place.h
     raise ValueError("bad side")
 
 def anchor_priority(anchor, room):
@@ -40,8 +44,8 @@ def anchor_priority(anchor, room):
     1) circulation anchors (hall)
     2) cross-zone
     """
-    room_zone = room.get("zone")
-    anchor_zone = anchor.get("zone")
+    room_zone = room.zone
+    anchor_zone = anchor.zone
 
     if room_zone is not None and anchor_zone == room_zone:
         return 0
@@ -59,8 +63,8 @@ def generate_attach_pos(room, anchor, side, step=2):
     Yield multiple (x,y) candidate placements by attaching room to `anchor`
     on a given side, then SLIDING along the shared wall.
     """
-    r_w, r_h = room["w"], room["h"]
-    ax, ay, aw, ah = anchor["x"], anchor["y"], anchor["w"], anchor["h"]
+    r_w, r_h = room.w, room.h
+    ax, ay, aw, ah = anchor.x, anchor.y, anchor.w, anchor.h
 
     if side == "right":
         x = ax + aw
@@ -82,6 +86,80 @@ def generate_attach_pos(room, anchor, side, step=2):
         for x in range(ax - r_w + 1, ax + aw, step):
             yield x, y
     
+def free_intervals(lo, hi, blocked):
+    """
+    Integer range [lo, hi] minus the closed intervals in `blocked`.
+    Returns the remaining free intervals as sorted (start, end) pairs.
+    """
+    free = []
+    cursor = lo
+    for b0, b1 in sorted(blocked):
+        if b1 < cursor:
+            continue
+        if b0 > hi:
+            break
+        if b0 > cursor:
+            free.append((cursor, b0 - 1))
+        cursor = max(cursor, b1 + 1)
+        if cursor > hi:
+            break
+    if cursor <= hi:
+        free.append((cursor, hi))
+    return free
+
+def feasible_attach_pos(room, anchor, side, placed_rooms, index=None):
+    """
+    Yield only overlap-free (x,y) placements of `room` on the given side of
+    `anchor`. Instead of sliding in steps, the exact free intervals along the
+    wall are computed by subtracting the projected extents of every placed
+    room in the way. Yielded in order: the ends of each free interval
+    (ascending, so the first one is what step=1 sliding would find), then
+    the anchor-aligned corners and the wall-centred position if free.
+    """
+    r_w, r_h = room.w, room.h
+    ax, ay, aw, ah = anchor.x, anchor.y, anchor.w, anchor.h
+
+    if side in ("right", "left"):
+        x = ax + aw if side == "right" else ax - r_w
+        lo, hi = ay - r_h + 1, ay + ah - 1
+        strip = (x, lo, r_w, hi - lo + r_h)
+    elif side in ("bottom", "top"):
+        y = ay + ah if side == "bottom" else ay - r_h
+        lo, hi = ax - r_w + 1, ax + aw - 1
+        strip = (lo, y, hi - lo + r_w, r_h)
+    else:
+        raise ValueError("bad side")
+
+    blockers = placed_rooms
+    if index is not None and hasattr(index, "near"):
+        blockers = index.near(*strip)
+
+    if side in ("right", "left"):
+        blocked = [
+            (b.y - r_h + 1, b.y + b.h - 1)
+            for b in blockers
+            if b.x < x + r_w and b.x + b.w > x
+        ]
+        preferred = (ay, ay + ah - r_h, ay + (ah - r_h) // 2)
+        to_xy = lambda p: (x, p)
+    else:
+        blocked = [
+            (b.x - r_w + 1, b.x + b.w - 1)
+            for b in blockers
+            if b.y < y + r_h and b.y + b.h > y
+        ]
+        preferred = (ax, ax + aw - r_w, ax + (aw - r_w) // 2)
+        to_xy = lambda p: (p, y)
+
+    free = free_intervals(lo, hi, blocked)
+
+    ordered = [p for a, b in free for p in (a, b)] + list(preferred)
+    seen = set()
+    for p in ordered:
+        if p not in seen and any(a <= p <= b for a, b in free):
+            seen.add(p)
+            yield to_xy(p)
+
 def bbox(rooms):
     """
     Compute the bounding box of a list of rooms.
@@ -91,10 +169,10 @@ def bbox(rooms):
     - fallback placement
     - normalization to positive coordinates
     """
-    min_x = min(r["x"] for r in rooms)
-    min_y = min(r["y"] for r in rooms)
-    max_x = max(r["x"] + r["w"] for r in rooms)
-    max_y = max(r["y"] + r["h"] for r in rooms)
+    min_x = min(r.x for r in rooms)
+    min_y = min(r.y for r in rooms)
+    max_x = max(r.x + r.w for r in rooms)
+    max_y = max(r.y + r.h for r in rooms)
     return min_x, min_y, max_x, max_y
 
 def normalize_to_origin(rooms):
@@ -110,20 +188,20 @@ def normalize_to_origin(rooms):
     min_x, min_y, _, _ = bbox(rooms)
     if min_x != 0 or min_y != 0:
         for r in rooms:
-            r["x"] -= min_x
-            r["y"] -= min_y
+            r.x -= min_x
+            r.y -= min_y
 
 def find_anchor_candidates(placed_rooms, room):
     """
     Find anchors that connect, then sort them by zone priorities.
     """
-    wants = set(room.get("connects_to", []))
+    wants = set(room.connects_to or ())
     candidates = []
 
     for anchor in placed_rooms:
         connects = (
-            anchor["type"] in wants or
-            room["type"] in anchor.get("connects_to", [])
+            anchor.type in wants or
+            room.type in (anchor.connects_to or ())
         )
         if connects:
             candidates.append(anchor)
@@ -134,35 +212,82 @@ def find_anchor_candidates(placed_rooms, room):
     candidates.sort(key=lambda a: anchor_priority(a, room))
     return candidates
 
-def try_place_adjacent(placed_rooms, room):
+def try_place_adjacent(placed_rooms, room, index=None, rng=None, candidates="slide",
+                       stats=None, constraints=None):
+    """
+    Attach `room` to one of the placed rooms. If `index` (a placement index
+    over `placed_rooms`, see make_placement_index) is given, the slide
+    positions of each anchor/side are tested through it instead of
+    re-checking the whole placed list.
+    `rng` is a random.Random (defaults to the global `random` module).
+    candidates="interval" uses feasible_attach_pos instead of step=2 sliding.
+    `stats` (a stats.SearchStats) counts candidates and overlap checks.
+    `constraints` (a constraints.PlacementState) drops candidates that
+    break a hard constraint before any overlap test.
+    """
+    rng = rng or random
     anchors = find_anchor_candidates(placed_rooms, room)
-    sides = room.get("preferred_sides", ["right", "bottom", "left", "top"])
+    sides = room.preferred_sides or ("right", "bottom", "left", "top")
 
     # Shuffle anchors *within* priority groups (keeps zone preference strong)
     grouped = {0: [], 1: [], 2: []}
     for a in anchors:
         grouped[anchor_priority(a, room)].append(a)
     for k in grouped:
-        random.shuffle(grouped[k])
+        rng.shuffle(grouped[k])
     anchors = grouped[0] + grouped[1] + grouped[2]
 
     # Keep preferred sides but allow variation
-    sides = sides[:]
-    if len(sides) > 2 and random.random() < 0.7:
+    sides = list(sides)
+    if len(sides) > 2 and rng.random() < 0.7:
         head = sides[:2]
         tail = sides[2:]
-        random.shuffle(tail)
+        rng.shuffle(tail)
         sides = head + tail
     else:
-        random.shuffle(sides)
+        rng.shuffle(sides)
 
     for anchor in anchors:
         for side in sides:
-            for cx, cy in generate_attach_pos(room, anchor, side, step=2):
-                test = dict(room)
-                test["x"], test["y"] = cx, cy
-                if no_overlap(placed_rooms + [test]):
-                    room["x"], room["y"] = cx, cy
+            if candidates == "interval":
+                positions = feasible_attach_pos(room, anchor, side, placed_rooms, index=index)
+                if stats is not None:
+                    # every position is already overlap-free: no per-candidate tests
+                    positions = list(positions)
+                    stats.count("interval_scans")
+                    stats.count("candidates", len(positions))
+                if constraints is not None:
+                    positions = (p for p in positions if constraints.admits(room, *p))
+                for pos in positions:
+                    room.x, room.y = pos
+                    return True
+                continue
+
+            positions = generate_attach_pos(room, anchor, side, step=2)
+            if stats is not None:
+                positions = list(positions)
+                stats.count("candidates", len(positions))
+            if constraints is not None:
+                positions = [p for p in positions if constraints.admits(room, *p)]
+
+            if index is not None:
+                pos = index.first_fit(positions, room.w, room.h, stats)
+                if stats is not None:
+                    # every index stops at the first fit
+                    stats.count("overlap_checks",
+                                len(positions) if pos is None else positions.index(pos) + 1)
+                if pos is not None:
+                    room.x, room.y = pos
+                    return True
+                continue
+
+            # placed rooms never overlap each other, so only the
+            # candidate rectangle needs checking (no per-candidate copy)
+            for cx, cy in positions:
+                if stats is not None:
+                    stats.count("overlap_checks")
+                if rect_fits(placed_rooms, cx, cy, room.w, room.h, stats):
+                    room.x, room.y = cx, cy
                     return True
 
     return False
@@ -171,36 +296,60 @@ def layout_compactness_score(rooms):
     """
     Smaller bounding box = better (more compact).
     """
-    min_x = min(r["x"] for r in rooms)
-    min_y = min(r["y"] for r in rooms)
-    max_x = max(r["x"] + r["w"] for r in rooms)
-    max_y = max(r["y"] + r["h"] for r in rooms)
+    min_x = min(r.x for r in rooms)
+    min_y = min(r.y for r in rooms)
+    max_x = max(r.x + r.w for r in rooms)
+    max_y = max(r.y + r.h for r in rooms)
     area = (max_x - min_x) * (max_y - min_y)
     return -area  # bigger negative is worse; closer to 0 is better
 
+# Bump whenever placement or scoring changes what generate_layout returns
+# for the same inputs (cached layouts are keyed on it).
+SCORING_VERSION = 2
+
+# Room-type adjacency rewards/penalties, looked up by type_pair().
+TYPE_REWARD = {
+    ("kitchen", "dining"): 30,
+    ("living", "dining"): 18,
+    ("kitchen", "living"): 18,   # encourages open concept / proximity
+    ("hall", "bedroom"): 20,
+    ("hall", "bathroom"): 20,
+}
+
+TYPE_PENALTY = {
+    ("bedroom", "kitchen"): 40,
+    ("bedroom", "dining"): 25,
+    ("bedroom", "living"): 25,
+    ("bathroom", "kitchen"): 20,  # optional (some homes allow, but usually not ideal)
+}
+
+# Zone adjacency scores, unordered pairs.
+ZONE_SCORE = {
+    # Good: private next to circulation (bedrooms/baths off hall)
+    frozenset(("private", "circulation")): 25,
+    # Good: public next to service (kitchen near living/dining)
+    frozenset(("public", "service")): 12,
+    # Bad: private directly touching service (bedroom touching kitchen)
+    frozenset(("private", "service")): -20,
+}
+
 def type_pair(a, b):
-    return tuple(sorted((a["type"], b["type"])))
+    return tuple(sorted((a.type, b.type)))
+
+def type_pair_score(type_a, type_b):
+    pair = tuple(sorted((type_a, type_b)))
+    return TYPE_REWARD.get(pair, 0) - TYPE_PENALTY.get(pair, 0)
+
+def zone_pair_score(zone_a, zone_b):
+    if zone_a == zone_b:
+        return 0
+    return ZONE_SCORE.get(frozenset((zone_a, zone_b)), 0)
 
 def layout_type_adjacency_score(rooms):
     """
     Reward/punish specific room-type adjacencies.
     Uses `touches()`.
     """
-    reward = {
-        ("kitchen", "dining"): 30,
-        ("living", "dining"): 18,
-        ("kitchen", "living"): 18,   # encourages open concept / proximity
-        ("hall", "bedroom"): 20,
-        ("hall", "bathroom"): 20,
-    }
-
-    penalty = {
-        ("bedroom", "kitchen"): 40,
-        ("bedroom", "dining"): 25,
-        ("bedroom", "living"): 25,
-        ("bathroom", "kitchen"): 20,  # optional (some homes allow, but usually not ideal)
-    }
-
     score = 0
     for i in range(len(rooms)):
         for j in range(i + 1, len(rooms)):
@@ -208,9 +357,7 @@ def layout_type_adjacency_score(rooms):
             if not touches(a, b):
                 continue
 
-            pair = type_pair(a, b)
-            score += reward.get(pair, 0)
-            score -= penalty.get(pair, 0)
+            score += type_pair_score(a.type, b.type)
 
     return score
 
@@ -226,19 +373,7 @@ def layout_zone_adjacency_score(rooms):
             if not touches(a, b):
                 continue
 
-            az, bz = a.get("zone"), b.get("zone")
-
-            # Good: private next to circulation (bedrooms/baths off hall)
-            if (az == "private" and bz == "circulation") or (bz == "private" and az == "circulation"):
-                score += 25
-
-            # Good: public next to service (kitchen near living/dining)
-            if (az == "public" and bz == "service") or (bz == "public" and az == "service"):
-                score += 12
-
-            # Bad: private directly touching service (bedroom touching kitchen)
-            if (az == "private" and bz == "service") or (bz == "private" and az == "service"):
-                score -= 20
+            score += zone_pair_score(a.zone, b.zone)
 
     return score
 
@@ -247,13 +382,146 @@ def score_layout(rooms):
     """
     Total score: higher is better.
     """
+    rooms = as_rooms(rooms)
     return (
         layout_zone_adjacency_score(rooms)
         + layout_type_adjacency_score(rooms)
         + layout_compactness_score(rooms)
     )
 
-def fallback_pack(placed_rooms, room, gap=0):
+def touching_pairs(rooms, index=None):
+    """
+    Yield every (a, b) pair of rooms that touches(), each pair once.
+    Uses a SpatialGrid, so the cost grows with the number of rooms times
+    their neighbours instead of with every pair.
+    """
+    index = index or build_grid(rooms)
+    order = {id(r): i for i, r in enumerate(rooms)}
+    for i, a in enumerate(rooms):
+        for b in index.near(a.x - 1, a.y - 1, a.w + 2, a.h + 2):
+            if order[id(b)] > i and touches(a, b):
+                yield a, b
+
+def score_layout_grid(rooms):
+    """
+    Same total as score_layout, with contacts found through a spatial grid
+    (near-linear in room count, for large plans).
+    """
+    rooms = as_rooms(rooms)
+    score = 0
+    for a, b in touching_pairs(rooms):
+        score += type_pair_score(a.type, b.type) + zone_pair_score(a.zone, b.zone)
+    return score + layout_compactness_score(rooms)
+
+def get_scorer(name="python"):
+    """
+    Layout scoring function:
+      - "python": score_layout, pure-Python pair loops
+      - "numpy":  scoring.score_layout_np, one vectorized contact matrix
+      - "grid":   score_layout_grid, contacts through a spatial grid
+    All return exactly the same score.
+    """
+    if name == "python":
+        return score_layout
+    if name == "grid":
+        return score_layout_grid
+    if name == "numpy":
+        from scoring import score_layout_np
+        return score_layout_np
+    raise ValueError("bad scorer")
+
+class PartialScore:
+    """
+    Running score of one attempt while rooms are being placed, and an
+    optimistic bound on the final score_layout() of that attempt.
+
+    Corridor trimming reshapes circulation rooms after placement, so only
+    contacts between two placed non-circulation rooms are final. Every
+    other pair is still "open" and counted at its best possible weight.
+    Compactness is bounded by the larger of the bbox of the placed
+    non-circulation rooms and their total floor area (rooms never overlap).
+
+    Pair weights only depend on (type, zone), so they are kept per class.
+    Built once per generate_layout call; reset() per attempt.
+    """
+
+    def __init__(self, template_rooms):
+        rooms = [as_room(r) for r in template_rooms]
+        self.class_of = {}
+        for r in rooms:
+            self.class_of.setdefault((r.type, r.zone), len(self.class_of))
+        labels = list(self.class_of)
+        k = len(labels)
+
+        self.weight = [
+            [type_pair_score(labels[a][0], labels[b][0]) + zone_pair_score(labels[a][1], labels[b][1])
+             for b in range(k)]
+            for a in range(k)
+        ]
+        self.best_weight = [[max(0, w) for w in row] for row in self.weight]
+        self.is_circulation = [labels[a][1] == "circulation" for a in range(k)]
+
+        sizes = [0] * k
+        for r in rooms:
+            sizes[self.class_of[(r.type, r.zone)]] += 1
+        self.total_open = 0
+        for a in range(k):
+            self.total_open += sizes[a] * (sizes[a] - 1) // 2 * self.best_weight[a][a]
+            for b in range(a + 1, k):
+                self.total_open += sizes[a] * sizes[b] * self.best_weight[a][b]
+
+        self.min_area = sum(
+            r.w * r.h for r in rooms if r.zone != "circulation"
+        )
+        self.reset()
+
+    def reset(self):
+        self.contacts = 0       # final contact score of settled pairs
+        self.settled_best = 0   # best-case weight of settled pairs
+        self.counts = [0] * len(self.class_of)
+        self.box = None
+
+    def add(self, room, neighbours):
+        """
+        Account for `room` once it is placed. `neighbours` are already
+        placed rooms that may touch it (a superset is fine).
+        """
+        a = self.class_of[(room.type, room.zone)]
+        if self.is_circulation[a]:
+            return
+
+        best_row = self.best_weight[a]
+        for c, n in enumerate(self.counts):
+            if n:
+                self.settled_best += n * best_row[c]
+
+        row = self.weight[a]
+        for nb in neighbours:
+            if nb is room or nb.zone == "circulation":
+                continue
+            if touches(room, nb):
+                self.contacts += row[self.class_of[(nb.type, nb.zone)]]
+
+        self.counts[a] += 1
+        x1, y1 = room.x + room.w, room.y + room.h
+        if self.box is None:
+            self.box = [room.x, room.y, x1, y1]
+        else:
+            b = self.box
+            b[0] = min(b[0], room.x)
+            b[1] = min(b[1], room.y)
+            b[2] = max(b[2], x1)
+            b[3] = max(b[3], y1)
+
+    def bound(self):
+        """Highest final score this attempt could still reach."""
+        area = 0
+        if self.box is not None:
+            area = (self.box[2] - self.box[0]) * (self.box[3] - self.box[1])
+        open_best = self.total_open - self.settled_best
+        return self.contacts + open_best - max(area, self.min_area)
+
+def fallback_pack(placed_rooms, room, gap=0, index=None):
     """
     Fallback placement method when adjacency placement fails.
 
@@ -262,63 +530,423 @@ def fallback_pack(placed_rooms, room, gap=0):
     2. If that overlaps, place it below the bounding box
     """
     _, _, max_x, min_y = bbox(placed_rooms)
-    room["x"] = max_x + gap
-    room["y"] = min_y
+    room.x = max_x + gap
+    room.y = min_y
 
     # if overlap anyway, move down by bbox height (rare with this method)
-    if not no_overlap(placed_rooms + [room]):
+    if index is not None:
+        overlaps = not index.fits(room.x, room.y, room.w, room.h)
+    else:
+        overlaps = not rect_fits(placed_rooms, room.x, room.y, room.w, room.h)
+    if overlaps:
         min_x, min_y, max_x, max_y = bbox(placed_rooms)
-        room["x"] = min_x
-        room["y"] = max_y + gap
+        room.x = min_x
+        room.y = max_y + gap
 
 def normalize_and_trim_corridors(rooms, corridor_width=4, pad=1):
     for hall in rooms:
-        if hall.get("zone") != "circulation":
+        if hall.zone != "circulation":
             continue
 
         # shrink width (keep centered)
-        center_x = hall["x"] + hall["w"] / 2
-        hall["w"] = corridor_width
-        hall["x"] = center_x - corridor_width / 2
+        center_x = hall.x + hall.w / 2
+        hall.w = corridor_width
+        hall.x = center_x - corridor_width / 2
 
         # find touching neighbors
         neighbors = [r for r in rooms if r is not hall and touches(hall, r)]
         if not neighbors:
             continue
 
-        min_y = min(r["y"] for r in neighbors) - pad
-        max_y = max(r["y"] + r["h"] for r in neighbors) + pad
+        min_y = min(r.y for r in neighbors) - pad
+        max_y = max(r.y + r.h for r in neighbors) + pad
 
-        hall["y"] = min_y
-        hall["h"] = max_y - min_y
+        hall.y = min_y
+        hall.h = max_y - min_y
+
+def make_placement_index(backend="grid"):
+    """
+    Placement index used while rooms are being placed:
+      - "grid":   SpatialGrid, checks candidates against nearby rooms
+      - "raster": numpy OccupancyRaster, tests a whole wall of slide
+                  positions against one prefix-summed strip (about 1.5-2x
+                  faster than "grid" up to a few hundred rooms, see
+                  raster.OccupancyRaster)
+    """
+    if backend == "grid":
+        return SpatialGrid()
+    if backend == "raster":
+        from raster import OccupancyRaster
+        return OccupancyRaster()
+    raise ValueError("bad backend")
+
+def layout_attempt(template_rooms, backend="grid", rng=None, bound=None, best_score=None,
+                   candidates="slide", stats=None, constraints=None):
+    """
+    One random restart: place every template room, then normalize
+    and trim corridors. Returns the placed rooms (fresh copies).
+
+    With a PartialScore `bound` and a `best_score`, the attempt is abandoned
+    (returns None) as soon as it can no longer score above best_score.
+    `stats` (a stats.SearchStats) gets placement / corridor timings.
+    With a compiled `constraints` engine, the attempt is also abandoned
+    when a room cannot be placed without breaking a hard constraint or the
+    finished layout fails one.
+    """
+    if stats is not None:
+        t0 = time.perf_counter()
+        stats.count("attempts")
+    rooms = [as_room(r).copy() for r in template_rooms]
+    prune = bound is not None and best_score is not None
+    if bound is not None:
+        bound.reset()
+    # per-attempt state: the compiled engine itself is shared and read-only
+    state = constraints.new_state() if constraints is not None else None
+
+    placed = []
+    index = make_placement_index(backend)
+    rooms[0].x, rooms[0].y = 0, 0
+    placed.append(rooms[0])
+    index.add(rooms[0])
+    if state is not None:
+        state.place(rooms[0])
+    if bound is not None:
+        bound.add(rooms[0], ())
+
+    for room in rooms[1:]:
+        ok = try_place_adjacent(placed, room, index=index, rng=rng, candidates=candidates,
+                                stats=stats, constraints=state)
+        if not ok:
+            if stats is not None:
+                stats.count("fallback_pack")
+            fallback_pack(placed, room, gap=0, index=index)
+            if state is not None and not state.admits(room, room.x, room.y):
+                # fallback_pack's other spot (below the layout) keeps the width
+                min_x, _, _, max_y = bbox(placed)
+                room.x, room.y = min_x, max_y
+                if not state.admits(room, room.x, room.y):
+                    if stats is not None:
+                        stats.add_time("placement", time.perf_counter() - t0)
+                        stats.count("attempts_rejected")
+                    return None
+        placed.append(room)
+        index.add(room)
+        if state is not None:
+            state.place(room)
+
+        if bound is not None:
+            if hasattr(index, "near"):
+                neighbours = index.near(room.x - 1, room.y - 1, room.w + 2, room.h + 2)
+            else:
+                neighbours = placed
+            bound.add(room, neighbours)
+            if prune and bound.bound() <= best_score:
+                if stats is not None:
+                    stats.add_time("placement", time.perf_counter() - t0)
+                    stats.count("attempts_pruned")
+                return None
+
+    if stats is not None:
+        t1 = time.perf_counter()
+        stats.add_time("placement", t1 - t0)
+    normalize_to_origin(placed)
+    normalize_and_trim_corridors(placed, corridor_width=4, pad=1)
+    normalize_to_origin(placed) #safety net
+    if stats is not None:
+        stats.add_time("corridors", time.perf_counter() - t1)
+    if constraints is not None and not constraints.satisfied(placed):
+        if stats is not None:
+            stats.count("attempts_rejected")
+        return None
+    return placed
+
+def timed_score(score, placed, stats=None):
+    """score(placed), adding "scoring" time to `stats`."""
+    if stats is None:
+        return score(placed)
+    t0 = time.perf_counter()
+    s = score(placed)
+    stats.add_time("scoring", time.perf_counter() - t0)
+    return s
+
+def seeded_attempt(template_rooms, seed, backend="grid", scorer="python", candidates="slide",
+                   stats=False, constraints=None):
+    """
+    Run one attempt with its own RNG. Top-level so process pools can pickle it.
+    Returns (score, rooms), or (score, rooms, SearchStats) with stats=True.
+    Score and rooms are None if `constraints` rejected the attempt.
+    """
+    if not stats:
+        placed = layout_attempt(template_rooms, backend=backend, rng=random.Random(seed),
+                                candidates=candidates, constraints=constraints)
+        if placed is None:
+            return None, None
+        return get_scorer(scorer)(placed), placed
+
+    from stats import SearchStats
+    stats = SearchStats()
+    placed = layout_attempt(template_rooms, backend=backend, rng=random.Random(seed),
+                            candidates=candidates, stats=stats, constraints=constraints)
+    if placed is None:
+        return None, None, stats
+    return timed_score(get_scorer(scorer), placed, stats), placed, stats
+
+def generate_layout(requirements, template_rooms, attempts=20, backend="grid",
+                    seeds=None, workers=None, executor=None, scorer="python",
+                    prune=False, candidates="slide", refine=None, large_plan=False,
+                    stats=None, constraints=None, top_k=None, min_difference=0.2):
+    """
+    Run random restarts and keep the best-scoring layout.
+
+    seeds:    one RNG seed per attempt (overrides `attempts`). Without seeds
+              and without a pool, attempts share the global `random` state.
+    workers:  run attempts across a ProcessPoolExecutor with this many
+              processes.
+    executor: an existing concurrent.futures executor to use instead.
+    scorer:   "python" or "numpy", see get_scorer.
+    prune:    abandon a serial attempt as soon as its optimistic bound
+              (PartialScore) cannot beat the best score so far.
+    candidates: "slide" (step=2 sliding along the anchor wall) or
+              "interval" (exact free intervals, see feasible_attach_pos).
+    refine:   run simulated annealing (anneal.refine_layout) on the best
+              layout; True for defaults or a dict of refine_layout kwargs
+              (iterations, t_start, t_end, schedule, moves, rng).
+    large_plan: True to use large.large_layout (zone clusters packed along
+              corridors, near-linear time) instead of the search; "auto"
+              does so above large.LARGE_PLAN_ROOMS rooms.
+    stats:    a stats.SearchStats to collect phase timings and search
+              counters in (placement counters come back from pool
+              workers too); its hook is called once at the end.
+    constraints: hard constraints (constraints.Constraint objects, or
+              "auto" for constraints_from_requirements: total_width
+              footprint, entrance on the outside, corridor clearance).
+              Compiled once; candidates that break one are skipped
+              before the overlap test and attempts that cannot satisfy
+              them are abandoned. ValueError if no attempt satisfies them
+              (with large_plan: if the large_layout result fails them).
+    top_k:    return a list of up to this many distinct layouts, best
+              first, from the same attempts (see diverse.TopLayouts):
+              mirrored / rotated copies count as one layout, and a layout
+              whose rooms differ from a better one's in less than
+              `min_difference` of the rooms (0..1) is dropped. With
+              `refine`, each of them is refined and the refined layouts
+              are filtered the same way again. With large_plan the list
+              holds the one large_layout result.
+
+    With the same seeds the result is identical whether attempts run
+    serially or in parallel (ties go to the earliest seed), with or
+    without pruning.
+    """
+    if stats is not None:
+        start = time.perf_counter()
+
+    if constraints is not None:
+        from constraints import compile_constraints
+        constraints = compile_constraints(constraints, template_rooms, requirements)
+
+    if large_plan:
+        from large import LARGE_PLAN_ROOMS, large_layout
+        if large_plan != "auto" or len(template_rooms) > LARGE_PLAN_ROOMS:
+            rooms = large_layout(requirements, template_rooms)
+            # no search to steer: the one result either passes or not
+            if constraints is not None and not constraints.satisfied(rooms):
+                raise ValueError("large-plan layout does not satisfy the constraints")
+            if stats is not None:
+                stats.add_time("placement", time.perf_counter() - start)
+                stats.add_time("generate", time.perf_counter() - start)
+                stats.emit("generate_layout")
+            # large_layout is deterministic: there is only one alternative
+            return rooms if top_k is None else [rooms]
+
+    parallel = executor is not None or workers is not None
+    if seeds is None and parallel:
+        seeds = [random.randrange(2**32) for _ in range(attempts)]
 
-def generate_layout(requirements, template_rooms, attempts=20):
     best_rooms = None
     best_score = None
+    top = None
+    if top_k is not None:
+        from diverse import TopLayouts
+        top = TopLayouts(top_k, min_difference)
+
+    if parallel:
+        run = partial(seeded_attempt, template_rooms, backend=backend, scorer=scorer,
+                      candidates=candidates, stats=stats is not None,
+                      constraints=constraints)
+        if executor is not None:
+            results = executor.map(run, seeds)
+        else:
+            # imported here: concurrent.futures.process is slow to import
+            # and only needed for pools
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run, seeds))
+
+        for i, (s, placed, *worker_stats) in enumerate(results):
+            if worker_stats:
+                stats.merge(worker_stats[0])
+            if placed is None:
+                continue
+            if top is not None:
+                top.add(s, placed)
+            if best_score is None or s > best_score:
+                best_score = s
+                best_rooms = placed
+                if stats is not None:
+                    stats.count("attempts_won")
+                    stats.counters["best_attempt"] = i
+    else:
+        score = get_scorer(scorer)
+        bound = PartialScore(template_rooms) if prune else None
+
+        for i, seed in enumerate(seeds if seeds is not None else [None] * attempts):
+            rng = random.Random(seed) if seed is not None else None
+            # with top_k an attempt only has to beat the k-th best
+            placed = layout_attempt(template_rooms, backend=backend, rng=rng,
+                                    bound=bound,
+                                    best_score=best_score if top is None else top.threshold(),
+                                    candidates=candidates, stats=stats,
+                                    constraints=constraints)
+            if placed is None:
+                continue
 
-    for _ in range(attempts):
-        rooms = [dict(r) for r in template_rooms]
-        for r in rooms:
-            r.setdefault("x", 0)
-            r.setdefault("y", 0)
-
-        placed = []
-        rooms[0]["x"], rooms[0]["y"] = 0, 0
-        placed.append(rooms[0])
-
-        for room in rooms[1:]:
-            ok = try_place_adjacent(placed, room)
-            if not ok:
-                fallback_pack(placed, room, gap=0)
-            placed.append(room)
+            s = timed_score(score, placed, stats)
+            if top is not None:
+                top.add(s, placed)
+            if best_score is None or s > best_score:
+                best_score = s
+                best_rooms = placed
+                if stats is not None:
+                    stats.count("attempts_won")
+                    stats.counters["best_attempt"] = i
+
+    if best_rooms is None and constraints is not None:
+        raise ValueError("no layout satisfies the constraints")
+
+    if top is not None:
+        results = top.results()
+
+    if refine and best_rooms:
+        from anneal import refine_layout
+        opts = {} if refine is True else dict(refine)
+        if seeds is not None:
+            opts.setdefault("rng", random.Random(seeds[0]))
+        if stats is not None:
+            t0 = time.perf_counter()
+        if top is not None:
+            # refining can pull alternatives together; filter them again
+            top = TopLayouts(top_k, min_difference)
+            for _, rooms in results:
+                rooms, s = refine_layout(rooms, **opts)
+                top.add(s, rooms)
+            results = top.results()
+        else:
+            best_rooms, best_score = refine_layout(best_rooms, **opts)
+        if stats is not None:
+            stats.add_time("refine", time.perf_counter() - t0)
+
+    if top is not None:
+        best_rooms = [rooms for _, rooms in results]
+        if stats is not None:
+            stats.count("alternatives", len(best_rooms))
+
+    if stats is not None:
+        stats.add_time("generate", time.perf_counter() - start)
+        stats.emit("generate_layout")
+    return best_rooms
+
+def search_layout(requirements, template_rooms, time_budget=1.0, patience=None,
+                  max_attempts=None, seed=None, backend="grid", scorer="python",
+                  prune=False, candidates="slide", refine=None, refine_share=0.5,
+                  clock=time.monotonic):
+    """
+    Anytime version of generate_layout: keep running random restarts until
+    `time_budget` seconds have passed, `patience` attempts in a row have not
+    improved the best score, or `max_attempts` is reached, then return the
+    best layout found so far. At least one attempt always runs.
+
+    Attempt seeds come from random.Random(seed), so with a fixed seed the
+    same number of attempts gives the same layout. If `refine` is set, the
+    restarts stop after (1 - refine_share) of the budget and annealing runs
+    on the best layout until the deadline.
+
+    Returns a dict:
+      rooms, score       best layout and its score
+      attempts, pruned   attempts run / abandoned early (prune=True)
+      best_attempt       1-based attempt number that found the best layout
+      best_time          seconds from start until it was found
+      elapsed            total seconds
+      stopped            "deadline", "patience" or "max_attempts"
+
+    Raises ValueError if time_budget, patience and max_attempts are all None.
+    """
+    if time_budget is None and patience is None and max_attempts is None:
+        raise ValueError("need a time_budget, patience or max_attempts")
+    start = clock()
+    deadline = search_deadline = None
+    if time_budget is not None:
+        deadline = start + time_budget
+        search_deadline = deadline
+        if refine:
+            search_deadline = start + time_budget * (1 - refine_share)
+    seed_rng = random.Random(seed)
+    score = get_scorer(scorer)
+    bound = PartialScore(template_rooms) if prune else None
 
-        normalize_to_origin(placed)
-        normalize_and_trim_corridors(placed, corridor_width=4, pad=1)
-        normalize_to_origin(placed) #safety net
+    best_rooms = None
+    best_score = None
+    best_attempt = None
+    best_time = None
+    attempts = pruned = 0
+    stopped = None
+
+    while True:
+        if attempts:
+            if max_attempts is not None and attempts >= max_attempts:
+                stopped = "max_attempts"
+                break
+            if search_deadline is not None and clock() >= search_deadline:
+                stopped = "deadline"
+                break
+            if patience is not None and attempts - best_attempt >= patience:
+                stopped = "patience"
+                break
+
+        attempts += 1
+        rng = random.Random(seed_rng.randrange(2**32))
+        placed = layout_attempt(template_rooms, backend=backend, rng=rng,
+                                bound=bound, best_score=best_score,
+                                candidates=candidates)
+        if placed is None:
+            pruned += 1
+            continue
 
-        s = score_layout(placed)
+        s = score(placed)
         if best_score is None or s > best_score:
             best_score = s
             best_rooms = placed
-
-    return best_rooms
\ No newline at end of file
+            best_attempt = attempts
+            best_time = clock() - start
+
+    if refine and best_rooms:
+        from anneal import refine_layout
+        opts = {} if refine is True else dict(refine)
+        opts.setdefault("rng", random.Random(seed))
+        if deadline is not None:
+            opts.setdefault("deadline", deadline)
+            opts.setdefault("clock", clock)
+        refined, refined_score = refine_layout(best_rooms, **opts)
+        if refined_score > best_score:
+            best_rooms, best_score = refined, refined_score
+            best_time = clock() - start
+
+    return {
+        "rooms": best_rooms,
+        "score": best_score,
+        "attempts": attempts,
+        "pruned": pruned,
+        "best_attempt": best_attempt,
+        "best_time": best_time,
+        "elapsed": clock() - start,
+        "stopped": stopped,
+    }
@@ -1,17 +1,121 @@
-from parser import parse_text
-from templates import get_template
-from layout import generate_layout
-from render_svg import draw_blueprint
+import argparse
+import json
+import os
+import sys
 
-def main():
-    user_input = "2 bedroom house with 2 bathrooms and a kitchen"
-    req = parse_text(user_input)
+# Heavy modules (layout search, renderer, pools) are imported inside the
+# functions that need them, so `--parse-only` never loads the layout code
+# and `--json` never loads the renderer.
+
+DEFAULT_PROMPT = "2 bedroom house with 2 bathrooms and a kitchen"
+
+
+def read_prompts(args):
+    """Prompts from the command line, then from each --file (one per line, "-" = stdin)."""
+    prompts = list(args.prompts)
+    for path in args.file:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with f:
+            prompts.extend(line.strip() for line in f if line.strip())
+    return prompts
 
+
+def layout_for(prompt, attempts, seed=None):
+    from layout import generate_layout
+    from parser import parse_text
+    from templates import get_template
+
+    req = parse_text(prompt)
     template_rooms = get_template(req["building_type"], req)
-    rooms = generate_layout(req, template_rooms)
+    if seed is None:
+        return req, generate_layout(req, template_rooms, attempts=attempts)
+
+    import random
+    rng = random.Random(seed)
+    seeds = [rng.randrange(2**32) for _ in range(attempts)]
+    return req, generate_layout(req, template_rooms, seeds=seeds)
+
+
+def run_prompts(prompts, args):
+    if args.parse_only:
+        from parser import parse_text
+        for prompt in prompts:
+            print(json.dumps({"prompt": prompt, "requirements": parse_text(prompt)}))
+        return
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    ext = ".json" if args.json else ".svgz" if args.svgz else ".svg"
+    failed = 0
+    for i, prompt in enumerate(prompts, start=1):
+        path = os.path.join(args.out_dir, f"prompt-{i:03d}{ext}")
+        try:
+            req, rooms = layout_for(prompt, args.attempts, args.seed)
+            if args.json:
+                from layout import score_layout
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "prompt": prompt,
+                        "requirements": req,
+                        "rooms": [r.to_dict() for r in rooms],
+                        "score": score_layout(rooms),
+                    }, f)
+            else:
+                from render_svg import draw_blueprint
+                draw_blueprint(rooms, filename=path, backend="stream",
+                               compact=args.compact, symbols=args.symbols)
+        except Exception as e:
+            # one bad prompt does not stop the rest
+            failed += 1
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        print(path)
+    return failed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate blueprint SVGs from text prompts.")
+    ap.add_argument("prompts", nargs="*", help="prompts; outputs go to --out-dir")
+    ap.add_argument("--file", action="append", default=[], metavar="PATH",
+                    help="read prompts from a file, one per line (- for stdin); repeatable")
+    ap.add_argument("--parse-only", action="store_true", help="print parsed requirements as JSON lines")
+    ap.add_argument("--json", action="store_true", help="write layout JSON instead of SVG")
+    ap.add_argument("--svgz", action="store_true", help="write gzip-compressed .svgz")
+    ap.add_argument("--compact", action="store_true", help="compact path-based SVG")
+    ap.add_argument("--symbols", action="store_true", help="SVG symbols for repeated rooms")
+    ap.add_argument("--seed", type=int, default=None, help="seed for reproducible layouts")
+    ap.add_argument("--batch", metavar="JSONL", help="stream prompts from a JSONL file")
+    ap.add_argument("--out-dir", default="out", help="output directory")
+    ap.add_argument("--workers", type=int, default=None, help="batch worker processes (0 = in-process)")
+    ap.add_argument("--attempts", type=int, default=20, help="layout attempts per prompt")
+    ap.add_argument("--serve", action="store_true", help="run the local HTTP service")
+    ap.add_argument("--host", default="127.0.0.1", help="service bind address")
+    ap.add_argument("--port", type=int, default=8000, help="service port")
+    ap.add_argument("--queue-size", type=int, default=None, help="service requests queued beyond the workers")
+    ap.add_argument("--timeout", type=float, default=30.0, help="service per-request timeout (seconds)")
+    args = ap.parse_args()
+
+    if args.serve:
+        from server import serve
+        serve(args.host, args.port, workers=args.workers, queue_size=args.queue_size,
+              timeout=args.timeout, attempts=args.attempts)
+        return
+
+    if args.batch:
+        from batch import run_batch
+        ok, failed = run_batch(args.batch, args.out_dir, workers=args.workers, attempts=args.attempts)
+        print(f"Batch done: {ok} generated, {failed} failed ({args.out_dir})")
+        return
+
+    prompts = read_prompts(args)
+    if prompts or args.parse_only:
+        if run_prompts(prompts or [DEFAULT_PROMPT], args):
+            sys.exit(1)
+        return
 
-    draw_blueprint(rooms, filename="output.svg")
+    from render_svg import draw_blueprint
+    _, rooms = layout_for(DEFAULT_PROMPT, args.attempts, args.seed)
+    draw_blueprint(rooms, filename="output.svg", backend="stream")
     print("Blueprint generated: output.svg")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,117 @@
 import re
 
+# keyword (as it appears in text) -> spec key it counts towards.
+# Adding a room type here does not add another scan of the text.
+ROOM_WORDS = {
+    "bathroom": "bathroom",
+    "bedroom": "bedroom",
+    "kitchen": "kitchen",
+    "seat": "seats",
+}
+
+# spec keys that only record presence (0/1), whatever number is given
+FLAG_KEYS = {"kitchen"}
+
+# keyword -> building_type (default is restaurant)
+BUILDING_WORDS = {
+    "house": "house",
+    "home": "house",
+}
+
+UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19,
+}
+TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+NUMBER_WORDS = set(UNITS) | set(TENS) | {"hundred", "and"}
+
+def _alternation(words):
+    # longest first so "bathroom" wins over any shorter prefix
+    return "|".join(sorted(map(re.escape, words), key=len, reverse=True))
+
+# One compiled pass finds every keyword; the number (if any) is read from
+# the few characters just before it, so the text is only scanned once.
+KEYWORD_RE = re.compile(_alternation(list(ROOM_WORDS) + list(BUILDING_WORDS)))
+LOOKBACK = 48
+
+def _words_value(words):
+    """
+    Value of a run of number words ("one hundred and twenty one",
+    "hundred", "twenty one"), or None if the run is not a number.
+    """
+    value = 0
+    if "hundred" in words:
+        k = words.index("hundred")
+        if not words[:k]:
+            value = 100
+        elif k == 1 and UNITS.get(words[0]):
+            value = UNITS[words[0]] * 100
+        else:
+            return None
+        words = words[k + 1:]
+        if words and words[0] == "and":
+            words = words[1:]
+            if not words:
+                return None
+    if words and words[0] in TENS:
+        value += TENS[words[0]]
+        words = words[1:]
+        if words and 0 < UNITS.get(words[0], 0) < 10:
+            value += UNITS[words[0]]
+            words = words[1:]
+    elif words and words[0] in UNITS:
+        value += UNITS[words[0]]
+        words = words[1:]
+    return None if words else value
+
+def number_before(text, pos):
+    """
+    Count written right before `pos`: digits ("2bathroom", "2 bathroom",
+    "2-bathroom"), or number words ("two", "twenty-one", "two-bedroom",
+    "one hundred"). None if absent.
+    """
+    head = text[max(0, pos - LOOKBACK):pos]
+    # a trailing hyphen separates like a space: "two-bedroom"
+    stripped = head.rstrip().rstrip("-").rstrip()
+    if not stripped:
+        return None
+
+    if stripped[-1].isdigit():
+        i = len(stripped) - 1
+        while i and stripped[i - 1].isdigit():
+            i -= 1
+        return int(stripped[i:])
+
+    if len(stripped) == len(head):
+        return None  # a word glued to the keyword is not a number word
+
+    tokens = stripped.replace("-", " ").split()
+    if pos > LOOKBACK:
+        tokens = tokens[1:]  # may be cut off mid-word
+    run = []
+    while tokens and tokens[-1] in NUMBER_WORDS:
+        run.insert(0, tokens.pop())
+    # the longest run of words that reads as a number
+    for i in range(len(run)):
+        value = _words_value(run[i:])
+        if value is not None:
+            return value
+    return None
+
 def parse_text(text):
     """
     Parse user input text and return structured requirements.
     Returns:
-        dict: {building_type, total_width, kitchen, bathroom, dining}
+        dict: {building_type, total_width, kitchen, bathroom, dining, bedroom, seats}
+
+    Counts come from the first "<number> <room>" seen (digits or number
+    words); a room mentioned without a number counts as 1.
     """
     text = text.lower()
 
@@ -15,29 +122,46 @@ def parse_text(text):
         "bathroom" : 0,
         "dining" : 1,
         "bedroom": 0,
+        "seats": 0,
     }
 
-    #detect house
-    if "house" in text or "home" in text:
-        spec["building_type"] = "house"
-
-    #detect kitchen
-    if "kitchen" in text:
-        spec["kitchen"] = 1
-
-    #detect bathroom
-    match = re.search(r'(\d+)\s*bathroom', text)
-    if match:
-        spec["bathroom"] = int(match.group(1))
-
-    elif "bathroom" in text:
-        spec["bathroom"] = 1
-
-    #detect bedrooms
-    match = re.search(r'(\d+)\s*bedroom', text)
-    if match:
-        spec["bedroom"] = int(match.group(1))
-    elif "bedroom" in text:
-        spec["bedroom"] = 1
-        
-    return spec
\ No newline at end of file
+    counted = set()
+    for m in KEYWORD_RE.finditer(text):
+        word = m.group()
+
+        building = BUILDING_WORDS.get(word)
+        if building is not None:
+            spec["building_type"] = building
+            continue
+
+        key = ROOM_WORDS[word]
+        if key in FLAG_KEYS:
+            spec[key] = 1
+            continue
+
+        num = number_before(text, m.start())
+        if num is not None:
+            if key not in counted:
+                spec[key] = num
+                counted.add(key)
+        elif key not in counted and key != "seats":
+            spec[key] = 1
+
+    return spec
+
+def parse_many(texts):
+    """
+    Parse an iterable of prompts; returns a list of specs in the same order.
+    """
+    return [parse_text(t) for t in texts]
+
+def as_requirements(prompt_or_spec):
+    """
+    Requirements from a prompt string (parse_text) or from a dict of
+    requirements; missing keys get parse_text's defaults.
+    """
+    if isinstance(prompt_or_spec, str):
+        return parse_text(prompt_or_spec)
+    if isinstance(prompt_or_spec, dict):
+        return dict(parse_text(""), **prompt_or_spec)
+    raise ValueError("need a prompt string or a requirements dict")
@@ -1,4 +1,10 @@
-import svgwrite
+import heapq
+import io
+import os
+import threading
+import time
+
+from room import as_rooms
 
 scale = 20
 door_size = 5          # door length in "room units"
@@ -16,24 +22,86 @@ def rooms_touch(r1, r2):
     """
     sides = []
     # r1 right touches r2 left
-    if r1["x"] + r1["w"] == r2["x"] and overlap(r1["y"], r1["h"], r2["y"], r2["h"]):
+    if r1.x + r1.w == r2.x and overlap(r1.y, r1.h, r2.y, r2.h):
         sides.append("right")
     # r1 left touches r2 right
-    if r2["x"] + r2["w"] == r1["x"] and overlap(r1["y"], r1["h"], r2["y"], r2["h"]):
+    if r2.x + r2.w == r1.x and overlap(r1.y, r1.h, r2.y, r2.h):
         sides.append("left")
     # r1 bottom touches r2 top
-    if r1["y"] + r1["h"] == r2["y"] and overlap(r1["x"], r1["w"], r2["x"], r2["w"]):
+    if r1.y + r1.h == r2.y and overlap(r1.x, r1.w, r2.x, r2.w):
         sides.append("bottom")
     # r1 top touches r2 bottom
-    if r2["y"] + r2["h"] == r1["y"] and overlap(r1["x"], r1["w"], r2["x"], r2["w"]):
+    if r2.y + r2.h == r1.y and overlap(r1.x, r1.w, r2.x, r2.w):
         sides.append("top")
     return sides
 
 
+def wall_overlaps(starts, ends):
+    """
+    Pairs (start_idx, end_idx) of intervals from `starts` and `ends` (wall
+    intervals on the same line) that overlap with positive length. starts / ends: lists of (lo, hi, idx).
+    Sweep by lo, keeping a heap of open intervals per list by hi.
+    """
+    events = sorted(
+        [(lo, hi, idx, 0) for lo, hi, idx in starts] +
+        [(lo, hi, idx, 1) for lo, hi, idx in ends]
+    )
+    active = ([], [])
+    pairs = []
+    for lo, hi, idx, kind in events:
+        if hi <= lo:
+            continue
+        for heap in active:
+            while heap and heap[0][0] <= lo:
+                heapq.heappop(heap)
+        for _, other in active[1 - kind]:
+            if other != idx:
+                pairs.append((other, idx) if kind else (idx, other))
+        heapq.heappush(active[kind], (hi, idx))
+    return pairs
+
+
+def touching_sides(rooms):
+    """
+    Same result as calling rooms_touch(rooms[i], rooms[j]) for every i < j,
+    without the O(n^2) pair loop: room edges are grouped by wall
+    coordinate and swept (see wall_overlaps).
+    Returns {(i, j): sides relative to rooms[i]} for touching pairs only.
+    """
+    # wall coordinate -> ([(lo, hi, idx) starting there], [... ending there])
+    v_walls = {}
+    h_walls = {}
+    for idx, r in enumerate(rooms):
+        v_walls.setdefault(r.x, ([], []))[0].append((r.y, r.y + r.h, idx))
+        v_walls.setdefault(r.x + r.w, ([], []))[1].append((r.y, r.y + r.h, idx))
+        h_walls.setdefault(r.y, ([], []))[0].append((r.x, r.x + r.w, idx))
+        h_walls.setdefault(r.y + r.h, ([], []))[1].append((r.x, r.x + r.w, idx))
+
+    # (i, j) -> set of sides relative to rooms[i]
+    found = {}
+    for walls, (before, after) in ((v_walls, ("right", "left")),
+                                   (h_walls, ("bottom", "top"))):
+        for starts, ends in walls.values():
+            if not starts or not ends:
+                continue
+            # `e` ends at the wall, `s` starts there: e is before s
+            for s, e in wall_overlaps(starts, ends):
+                if e < s:
+                    found.setdefault((e, s), set()).add(before)
+                else:
+                    found.setdefault((s, e), set()).add(after)
+
+    order = ("right", "left", "bottom", "top")  # same order as rooms_touch
+    return {
+        pair: [side for side in order if side in sides]
+        for pair, sides in sorted(found.items())
+    }
+
+
 def should_connect(a, b):
     return (
-        b["type"] in a.get("connects_to", []) or
-        a["type"] in b.get("connects_to", [])
+        b.type in (a.connects_to or ()) or
+        a.type in (b.connects_to or ())
     )
 
 
@@ -95,17 +163,17 @@ def door_opening_on_shared_wall(r1, r2, side):
     # Detect if one room is a corridor/hall
     corridor = None
     other = None
-    if r1.get("zone") == "circulation":
+    if r1.zone == "circulation":
         corridor, other = r1, r2
-    elif r2.get("zone") == "circulation":
+    elif r2.zone == "circulation":
         corridor, other = r2, r1
 
     # --------------------------
     # Vertical shared wall (left/right)
     # --------------------------
     if side in ("left", "right"):
-        overlap_start = max(r1["y"], r2["y"])
-        overlap_end   = min(r1["y"] + r1["h"], r2["y"] + r2["h"])
+        overlap_start = max(r1.y, r2.y)
+        overlap_end   = min(r1.y + r1.h, r2.y + r2.h)
         if overlap_end - overlap_start < min_overlap_units:
             return None
 
@@ -113,7 +181,7 @@ def door_opening_on_shared_wall(r1, r2, side):
         # - If corridor exists, align to corridor centerline (Y)
         # - Otherwise, use overlap center (old behavior)
         if corridor is not None:
-            center = corridor["y"] + corridor["h"] / 2
+            center = corridor.y + corridor.h / 2
             # Clamp center into overlap so the door stays on the shared segment
             center = max(overlap_start + door_size / 2, min(center, overlap_end - door_size / 2))
         else:
@@ -123,15 +191,15 @@ def door_opening_on_shared_wall(r1, r2, side):
         y2 = center + door_size / 2
 
         # x coordinate of the shared wall (in units)
-        x = r1["x"] if side == "left" else (r1["x"] + r1["w"])
+        x = r1.x if side == "left" else (r1.x + r1.w)
         return ("v", x, y1, y2)
 
     # --------------------------
     # Horizontal shared wall (top/bottom)
     # --------------------------
     if side in ("top", "bottom"):
-        overlap_start = max(r1["x"], r2["x"])
-        overlap_end   = min(r1["x"] + r1["w"], r2["x"] + r2["w"])
+        overlap_start = max(r1.x, r2.x)
+        overlap_end   = min(r1.x + r1.w, r2.x + r2.w)
         if overlap_end - overlap_start < min_overlap_units:
             return None
 
@@ -139,7 +207,7 @@ def door_opening_on_shared_wall(r1, r2, side):
         # - If corridor exists, align to corridor centerline (X)
         # - Otherwise, use overlap center
         if corridor is not None:
-            center = corridor["x"] + corridor["w"] / 2
+            center = corridor.x + corridor.w / 2
             center = max(overlap_start + door_size / 2, min(center, overlap_end - door_size / 2))
         else:
             center = (overlap_start + overlap_end) / 2
@@ -148,7 +216,7 @@ def door_opening_on_shared_wall(r1, r2, side):
         x2 = center + door_size / 2
 
         # y coordinate of the shared wall (in units)
-        y = r1["y"] if side == "top" else (r1["y"] + r1["h"])
+        y = r1.y if side == "top" else (r1.y + r1.h)
         return ("h", y, x1, x2)
 
     return None
@@ -159,15 +227,15 @@ def draw_shared_door(dwg, r1, r2, side, offset_x_px=0, offset_y_px=0):
     centered on their overlap segment (in room units).
     offset_x_px / offset_y_px lets us shift drawing by a margin.
     """
-    x_px = r1["x"] * scale + offset_x_px
-    y_px = r1["y"] * scale + offset_y_px
-    w_px = r1["w"] * scale
-    h_px = r1["h"] * scale
+    x_px = r1.x * scale + offset_x_px
+    y_px = r1.y * scale + offset_y_px
+    w_px = r1.w * scale
+    h_px = r1.h * scale
     min_overlap_units = door_size + 2
 
     if side in ("top", "bottom"):
-        overlap_start = max(r1["x"], r2["x"])
-        overlap_end = min(r1["x"] + r1["w"], r2["x"] + r2["w"])
+        overlap_start = max(r1.x, r2.x)
+        overlap_end = min(r1.x + r1.w, r2.x + r2.w)
         overlap_len = overlap_end - overlap_start
         if overlap_len < min_overlap_units:
             return
@@ -176,8 +244,8 @@ def draw_shared_door(dwg, r1, r2, side, offset_x_px=0, offset_y_px=0):
         draw_door(dwg, x_px, y_px, w_px, h_px, side, center_override=center_x_px)
 
     elif side in ("left", "right"):
-        overlap_start = max(r1["y"], r2["y"])
-        overlap_end = min(r1["y"] + r1["h"], r2["y"] + r2["h"])
+        overlap_start = max(r1.y, r2.y)
+        overlap_end = min(r1.y + r1.h, r2.y + r2.h)
         overlap_len = overlap_end - overlap_start
         if overlap_len < min_overlap_units:
             return
@@ -194,25 +262,25 @@ def exterior_sides(room, max_x, max_y):
       y+h == max_y is bottom edge
     """
     sides = []
-    if room["y"] == 0:
+    if room.y == 0:
         sides.append("top")
-    if room["x"] == 0:
+    if room.x == 0:
         sides.append("left")
-    if room["x"] + room["w"] == max_x:
+    if room.x + room.w == max_x:
         sides.append("right")
-    if room["y"] + room["h"] == max_y:
+    if room.y + room.h == max_y:
         sides.append("bottom")
     return sides
 
 
 def entrance_room(rooms):
     for r in rooms:
-        if r.get("is_entrance"):
+        if r.is_entrance:
             return r
     for r in rooms:
-        if r["type"] == "dining":
+        if r.type == "dining":
             return r
-    return max(rooms, key=lambda r: r["w"] * r["h"])
+    return max(rooms, key=lambda r: r.w * r.h)
 
 
 def pick_entrance_side(room, max_x, max_y):
@@ -220,7 +288,7 @@ def pick_entrance_side(room, max_x, max_y):
     if not outside:
         return None
 
-    preferred = room.get("entrance_side")
+    preferred = room.entrance_side
     if preferred in outside:
         return preferred
 
@@ -239,8 +307,8 @@ def choose_best_shared_side(a, b, touching_sides):
     def flip(side):
         return {"left":"right", "right":"left", "top":"bottom", "bottom":"top"}[side]
 
-    a_pref = a.get("preferred_sides", [])
-    b_pref = b.get("preferred_sides", [])
+    a_pref = a.preferred_sides or ()
+    b_pref = b.preferred_sides or ()
 
     # Lower score is better
     def score(side_for_a):
@@ -277,39 +345,39 @@ def exterior_door_opening(room, side, max_x, max_y):
     only if the room actually touches that exterior side.
     """
     # Verify it's truly on the exterior
-    if side == "top" and room["y"] != 0:
+    if side == "top" and room.y != 0:
         return None
-    if side == "bottom" and room["y"] + room["h"] != max_y:
+    if side == "bottom" and room.y + room.h != max_y:
         return None
-    if side == "left" and room["x"] != 0:
+    if side == "left" and room.x != 0:
         return None
-    if side == "right" and room["x"] + room["w"] != max_x:
+    if side == "right" and room.x + room.w != max_x:
         return None
 
     if side in ("top", "bottom"):
-        y = room["y"] if side == "top" else (room["y"] + room["h"])
-        center = room["x"] + room["w"] / 2
+        y = room.y if side == "top" else (room.y + room.h)
+        center = room.x + room.w / 2
         x1 = center - door_size / 2
         x2 = center + door_size / 2
         # clamp inside room span
-        x1 = max(room["x"], x1)
-        x2 = min(room["x"] + room["w"], x2)
+        x1 = max(room.x, x1)
+        x2 = min(room.x + room.w, x2)
         return ("h", y, x1, x2)
 
     if side in ("left", "right"):
-        x = room["x"] if side == "left" else (room["x"] + room["w"])
-        center = room["y"] + room["h"] / 2
+        x = room.x if side == "left" else (room.x + room.w)
+        center = room.y + room.h / 2
         y1 = center - door_size / 2
         y2 = center + door_size / 2
-        y1 = max(room["y"], y1)
-        y2 = min(room["y"] + room["h"], y2)
+        y1 = max(room.y, y1)
+        y2 = min(room.y + room.h, y2)
         return ("v", x, y1, y2)
 
     return None
 
 def room_edges(room):
     """Return the 4 edges of a room in ROOM UNITS."""
-    x, y, w, h = room["x"], room["y"], room["w"], room["h"]
+    x, y, w, h = room.x, room.y, room.w, room.h
     # each edge: ((x1,y1),(x2,y2)) in units
     return [
         ((x, y), (x + w, y)),         # top
@@ -318,116 +386,148 @@ def room_edges(room):
         ((x + w, y), (x + w, y + h)), # right
     ]
 
-def norm_edge(e):
-    """Normalize edge direction so shared walls match."""
-    (a, b) = e
-    return (a, b) if a <= b else (b, a)
-
-def draw_walls(dwg, rooms, offset_x_px, offset_y_px, openings=None):
+def wall_graph(rooms):
+    """
+    Merge room edges into walls. Edges are grouped by axis coordinate and
+    unioned: every stretch covered by one room is exterior wall, stretches
+    covered by two or more rooms are interior wall. Collinear stretches of
+    the same kind that meet end to end become one segment, and partially
+    overlapping edges are no longer drawn twice.
+    Returns {("v", x) or ("h", y): [(lo, hi, stroke_w), ...]} in ROOM UNITS.
+    """
+    # (axis, coordinate) -> list of (position, +1 / -1) along the wall
+    events = {}
+    for r in rooms:
+        for (x1, y1), (x2, y2) in room_edges(r):
+            if x1 == x2:
+                key, lo, hi = ("v", x1), y1, y2
+            else:
+                key, lo, hi = ("h", y1), x1, x2
+            if hi > lo:
+                events.setdefault(key, []).extend(((lo, 1), (hi, -1)))
+
+    walls = {}
+    for key, evs in events.items():
+        evs.sort()
+        segments = []
+        depth = 0
+        prev = None
+        for pos, step in evs:
+            if depth and pos > prev:
+                stroke_w = wall_thickness if depth == 1 else 2
+                if segments and segments[-1][1] == prev and segments[-1][2] == stroke_w:
+                    segments[-1] = (segments[-1][0], pos, stroke_w)
+                else:
+                    segments.append((prev, pos, stroke_w))
+            depth += step
+            prev = pos
+        walls[key] = segments
+    return walls
+
+def cut_openings(lo, hi, cuts):
+    """Parts of lo..hi left after removing the (c1, c2) door openings."""
+    cuts = [(max(lo, c1), min(hi, c2)) for (c1, c2) in cuts]
+    cuts = [(c1, c2) for (c1, c2) in cuts if c2 > c1]
+    cuts.sort()
+
+    segments = []
+    cursor = lo
+    for c1, c2 in cuts:
+        if c1 > cursor:
+            segments.append((cursor, c1))
+        cursor = max(cursor, c2)
+    if cursor < hi:
+        segments.append((cursor, hi))
+    return segments
+
+def wall_lines(rooms, offset_x_px, offset_y_px, openings=None):
     """
-    Draw walls ONCE using shared-edge counting.
-    If openings provided, cut gaps (doors) into wall lines.
+    Wall segments to draw, in PIXELS: yields (start, end, stroke_w) for
+    the walls of wall_graph with the door openings cut out.
     openings: list of ("v", x, y1, y2) or ("h", y, x1, x2) in ROOM UNITS.
     """
     openings = openings or []
 
-    # index openings for quick lookup
-    v_open = {}  # x -> list of (y1,y2)
-    h_open = {}  # y -> list of (x1,x2)
-
-    for o in openings:
-        if o[0] == "v":
-            _, x, y1, y2 = o
-            v_open.setdefault(x, []).append((y1, y2))
-        else:
-            _, y, x1, x2 = o
-            h_open.setdefault(y, []).append((x1, x2))
-
-    edge_counts = {}
-    for r in rooms:
-        for e in room_edges(r):
-            k = norm_edge(e)
-            edge_counts[k] = edge_counts.get(k, 0) + 1
-
-    for (p1, p2), count in edge_counts.items():
-        (x1u, y1u), (x2u, y2u) = p1, p2
-
-        stroke_w = wall_thickness if count == 1 else 2
-
-        # vertical edge
-        if x1u == x2u:
-            x = x1u
-            y1, y2 = sorted([y1u, y2u])
-
-            cuts = v_open.get(x, [])
-            cuts = [(max(y1, c1), min(y2, c2)) for (c1, c2) in cuts]
-            cuts = [(c1, c2) for (c1, c2) in cuts if c2 > c1]
-            cuts.sort()
-
-            segments = []
-            cursor = y1
-            for c1, c2 in cuts:
-                if c1 > cursor:
-                    segments.append((cursor, c1))
-                cursor = max(cursor, c2)
-            if cursor < y2:
-                segments.append((cursor, y2))
-
-            for sy1, sy2 in segments:
-                dwg.add(dwg.line(
-                    start=(x * scale + offset_x_px, sy1 * scale + offset_y_px),
-                    end=(x * scale + offset_x_px, sy2 * scale + offset_y_px),
-                    stroke="black",
-                    stroke_width=stroke_w
-                ))
-
-        # horizontal edge
-        else:
-            y = y1u
-            x1, x2 = sorted([x1u, x2u])
-
-            cuts = h_open.get(y, [])
-            cuts = [(max(x1, c1), min(x2, c2)) for (c1, c2) in cuts]
-            cuts = [(c1, c2) for (c1, c2) in cuts if c2 > c1]
-            cuts.sort()
-
-            segments = []
-            cursor = x1
-            for c1, c2 in cuts:
-                if c1 > cursor:
-                    segments.append((cursor, c1))
-                cursor = max(cursor, c2)
-            if cursor < x2:
-                segments.append((cursor, x2))
-
-            for sx1, sx2 in segments:
-                dwg.add(dwg.line(
-                    start=(sx1 * scale + offset_x_px, y * scale + offset_y_px),
-                    end=(sx2 * scale + offset_x_px, y * scale + offset_y_px),
-                    stroke="black",
-                    stroke_width=stroke_w
-                ))
-
-def draw_blueprint(rooms, filename):
-    # compute building bounds in ROOM UNITS
-    max_x = max(room["x"] + room["w"] for room in rooms)
-    max_y = max(room["y"] + room["h"] for room in rooms)
-
-    width_px = max_x * scale
-    height_px = max_y * scale
-
-    # Add margins so exterior doors never get clipped
-    dwg = svgwrite.Drawing(
-        filename,
-        size=(width_px + 2 * margin, height_px + 2 * margin)
-    )
+    # index openings for quick lookup: ("v", x) -> [(y1, y2)], ("h", y) -> [(x1, x2)]
+    cuts_at = {}
+    for axis, at, c1, c2 in openings:
+        cuts_at.setdefault((axis, at), []).append((c1, c2))
+
+    for (axis, at), segments in wall_graph(rooms).items():
+        cuts = cuts_at.get((axis, at), [])
+        for lo, hi, stroke_w in segments:
+            for s1, s2 in cut_openings(lo, hi, cuts):
+                if axis == "v":
+                    start = (at * scale + offset_x_px, s1 * scale + offset_y_px)
+                    end = (at * scale + offset_x_px, s2 * scale + offset_y_px)
+                else:
+                    start = (s1 * scale + offset_x_px, at * scale + offset_y_px)
+                    end = (s2 * scale + offset_x_px, at * scale + offset_y_px)
+                yield start, end, stroke_w
+
+def draw_walls(dwg, rooms, offset_x_px, offset_y_px, openings=None, classes=False):
+    """
+    Draw walls ONCE, merged per axis coordinate (see wall_graph), one
+    <line> per segment. If openings provided, cut gaps (doors) into walls.
+    With `classes`, lines are grouped per stroke width in a <g> styled by
+    STYLE_CSS instead of carrying their own stroke attributes.
+    """
+    lines = wall_lines(rooms, offset_x_px, offset_y_px, openings)
+    if not classes:
+        for start, end, stroke_w in lines:
+            dwg.add(dwg.line(
+                start=start,
+                end=end,
+                stroke="black",
+                stroke_width=stroke_w
+            ))
+        return
+
+    groups = {}  # stroke_w -> <g>, in order of first use
+    for start, end, stroke_w in lines:
+        if stroke_w not in groups:
+            groups[stroke_w] = dwg.g(class_=f"wall w{stroke_w}")
+        groups[stroke_w].add(dwg.line(start=start, end=end))
+    for g in groups.values():
+        dwg.add(g)
+
+def fmt_num(v, precision):
+    """`v` rounded to `precision` decimals, without trailing zeros."""
+    text = f"{v:.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+def draw_wall_paths(dwg, rooms, offset_x_px, offset_y_px, openings=None, precision=1,
+                    classes=False):
+    """
+    Compact draw_walls: one <path> per stroke width instead of one <line>
+    per segment, coordinates rounded to `precision` decimals.
+    """
+    paths = {}  # stroke_w -> path commands, in order of first use
+    for (x1, y1), (x2, y2), stroke_w in wall_lines(rooms, offset_x_px, offset_y_px, openings):
+        to = f"V{fmt_num(y2, precision)}" if x1 == x2 else f"H{fmt_num(x2, precision)}"
+        paths.setdefault(stroke_w, []).append(
+            f"M{fmt_num(x1, precision)} {fmt_num(y1, precision)}{to}"
+        )
+
+    for stroke_w, d in paths.items():
+        if classes:
+            dwg.add(dwg.path(d="".join(d), class_=f"wall w{stroke_w}"))
+            continue
+        dwg.add(dwg.path(
+            d="".join(d),
+            fill="none",
+            stroke="black",
+            stroke_width=stroke_w
+        ))
 
-    # Rooms
+def draw_rooms(dwg, rooms):
     for room in rooms:
-        x = room["x"] * scale + margin
-        y = room["y"] * scale + margin
-        w = room["w"] * scale
-        h = room["h"] * scale
+        x = room.x * scale + margin
+        y = room.y * scale + margin
+        w = room.w * scale
+        h = room.h * scale
 
         dwg.add(dwg.rect(
             insert=(x, y),
@@ -437,36 +537,193 @@ def draw_blueprint(rooms, filename):
         ))
 
         dwg.add(dwg.text(
-            room["name"],
+            room.name,
             insert=(x + w / 2, y + h / 2),
             text_anchor="middle",
             alignment_baseline="middle",
             font_size=14
         ))
-    openings = []
-    for i in range(len(rooms)):
-        for j in range(i + 1, len(rooms)):
-            a, b = rooms[i], rooms[j]
-            if not should_connect(a, b):
-                continue
-            sides = rooms_touch(a, b)
-            if not sides:
-                continue
 
-            best_side = choose_best_shared_side(a, b, sides)
-            o = door_opening_on_shared_wall(a, b, best_side)
-            if o:
-                openings.append(o)
+def draw_rooms_compact(dwg, rooms, precision=1):
+    """Room fills as a single <path>, then the labels."""
+    d = []
+    for room in rooms:
+        x = fmt_num(room.x * scale + margin, precision)
+        y = fmt_num(room.y * scale + margin, precision)
+        w = fmt_num(room.w * scale, precision)
+        h = fmt_num(room.h * scale, precision)
+        d.append(f"M{x} {y}h{w}v{h}h-{w}z")
+    dwg.add(dwg.path(d="".join(d), fill="lightblue", stroke="none"))
+
+    for room in rooms:
+        x = (room.x + room.w / 2) * scale + margin
+        y = (room.y + room.h / 2) * scale + margin
+        dwg.add(dwg.text(
+            room.name,
+            insert=(fmt_num(x, precision), fmt_num(y, precision)),
+            text_anchor="middle",
+            alignment_baseline="middle",
+            font_size=14
+        ))
+
+# shared styles for symbols mode
+STYLE_CSS = (
+    ".label{font-size:14px;text-anchor:middle;alignment-baseline:middle}"
+    ".wall{fill:none;stroke:black}"
+    f".w2{{stroke-width:2}}.w{wall_thickness}{{stroke-width:{wall_thickness}}}"
+)
+
+def draw_rooms_symbols(dwg, rooms, precision=None):
+    """
+    Rooms as <use> instances of one <symbol> per distinct (type, w, h),
+    labels in one <g class="label">. Coordinates are rounded to
+    `precision` decimals if given.
+    """
+    def px(v):
+        return v if precision is None else fmt_num(v, precision)
+
+    dwg.defs.add(dwg.style(STYLE_CSS))
+    symbols = {}
+    for room in rooms:
+        key = (room.type, room.w, room.h)
+        if key not in symbols:
+            symbol = dwg.symbol(id=f"r{len(symbols)}", overflow="visible")
+            symbol.add(dwg.rect(
+                insert=(0, 0),
+                size=(px(room.w * scale), px(room.h * scale)),
+                fill="lightblue",
+                stroke="none",
+            ))
+            dwg.defs.add(symbol)
+            symbols[key] = symbol
+
+    for room in rooms:
+        symbol = symbols[(room.type, room.w, room.h)]
+        dwg.add(dwg.use(symbol, insert=(px(room.x * scale + margin), px(room.y * scale + margin))))
+
+    labels = dwg.g(class_="label")
+    for room in rooms:
+        x = (room.x + room.w / 2) * scale + margin
+        y = (room.y + room.h / 2) * scale + margin
+        labels.add(dwg.text(room.name, insert=(px(x), px(y))))
+    dwg.add(labels)
+
+SVG_BACKENDS = ("svgwrite", "stream")
 
-    draw_walls(dwg, rooms, margin, margin, openings=openings)
-    
-    # Exterior entrance
+def draw_blueprint(rooms, filename=None, backend="svgwrite", compact=False, precision=1,
+                   symbols=False, stats=None):
+    """
+    Render `rooms` as an SVG blueprint.
+    filename: path or text file object to write to; None returns the
+              SVG as utf-8 bytes instead (for serving from memory).
+    backend:  "svgwrite" builds an svgwrite.Drawing and serializes it at
+              the end; "stream" writes each element as it is drawn
+              (svgstream.SvgStream), no element tree and no validation.
+              Both produce the same bytes.
+    compact:  draw all room fills as one <path> and walls as one <path>
+              per stroke width, coordinates rounded to `precision`
+              decimals. Much smaller files for large plans.
+    symbols:  define each distinct (type, w, h) room once as a <symbol>
+              and place rooms with <use>; labels and walls are styled by
+              shared CSS classes instead of per-element attributes.
+    stats:    a stats.SearchStats; gets "rendering" time and "openings"
+              (door openings cut into the walls, entrance included).
+    A filename ending in ".svgz" is written gzip-compressed. A path is
+    written to a temporary file next to it and renamed over it when
+    rendering succeeds, so a failed render leaves any old file intact.
+    """
+    if backend not in SVG_BACKENDS:
+        raise ValueError("bad backend")
+    options = dict(compact=compact, precision=precision, symbols=symbols, stats=stats)
+    if filename is None:
+        out = io.StringIO()
+        render_blueprint(rooms, out, backend, **options)
+        return out.getvalue().encode("utf-8")
+    if hasattr(filename, "write"):
+        render_blueprint(rooms, filename, backend, **options)
+        return None
+    tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if str(filename).endswith(".svgz"):
+            import gzip
+            # mtime=0 keeps the output reproducible; the header names the
+            # final file, not the temporary one
+            with open(tmp, "wb") as f:
+                raw = gzip.GzipFile(filename, "wb", mtime=0, fileobj=f)
+                with io.TextIOWrapper(raw, encoding="utf-8") as out:
+                    render_blueprint(rooms, out, backend, **options)
+        else:
+            with open(tmp, "w", encoding="utf-8") as out:
+                render_blueprint(rooms, out, backend, **options)
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def render_blueprint(rooms, out, backend, compact=False, precision=1, symbols=False,
+                     stats=None):
+    if stats is not None:
+        start = time.perf_counter()
+    rooms = as_rooms(rooms)
+
+    # compute building bounds in ROOM UNITS
+    max_x = max(room.x + room.w for room in rooms)
+    max_y = max(room.y + room.h for room in rooms)
+
+    width_px = max_x * scale
+    height_px = max_y * scale
+
+    # Add margins so exterior doors never get clipped
+    size = (width_px + 2 * margin, height_px + 2 * margin)
+    if backend == "stream":
+        from svgstream import SvgStream
+        dwg = SvgStream(out, size)
+    else:
+        import svgwrite
+        dwg = svgwrite.Drawing(size=size)
+
+    if symbols:
+        draw_rooms_symbols(dwg, rooms, precision if compact else None)
+    elif compact:
+        draw_rooms_compact(dwg, rooms, precision)
+    else:
+        draw_rooms(dwg, rooms)
+
+    openings = []
+    for (i, j), sides in touching_sides(rooms).items():
+        a, b = rooms[i], rooms[j]
+        if not should_connect(a, b):
+            continue
+
+        best_side = choose_best_shared_side(a, b, sides)
+        o = door_opening_on_shared_wall(a, b, best_side)
+        if o:
+            openings.append(o)
+
+    # Exterior entrance: cut with the interior doors, before the walls are drawn
     entry = entrance_room(rooms)
     side = pick_entrance_side(entry, max_x, max_y)
 
     if side:
         opening = exterior_door_opening(entry, side, max_x, max_y)
         if opening:
-            openings.append(o)
-
-    dwg.save()
+            openings.append(opening)
+
+    if compact:
+        draw_wall_paths(dwg, rooms, margin, margin, openings=openings, precision=precision,
+                        classes=symbols)
+    else:
+        draw_walls(dwg, rooms, margin, margin, openings=openings, classes=symbols)
+
+    if backend == "stream":
+        dwg.close()
+    else:
+        dwg.write(out)
+
+    if stats is not None:
+        stats.add_time("rendering", time.perf_counter() - start)
+        stats.count("openings", len(openings))
+        stats.emit("draw_blueprint")
@@ -0,0 +1,172 @@
+from collections.abc import Mapping
+
+
+class Room:
+    """
+    Compact room record (ROOM UNITS for x/y/w/h).
+
+    Hot code reads attributes (room.x, room.zone). For older callers a Room
+    also behaves like the dicts templates used to return: room["x"],
+    room.get("zone"), "zone" in room, room.setdefault(...). A field set to
+    None counts as missing, so room.get("zone", "public") still falls back
+    like it did for a dict without that key, and fields a dict did not
+    give stay missing (a template room has no "x" until it is placed).
+    Unknown keys go to `extra`. Iteration, len(), keys/values/items and
+    == against a dict follow the same rules, and connects_to /
+    preferred_sides read back as lists, so dict(room) rebuilds the dict
+    (Room is registered as a collections.abc.Mapping). json only encodes
+    real dicts: use to_dict(), or json.dumps(rooms, default=json_default).
+    """
+
+    __slots__ = (
+        "name", "type", "zone",
+        "x", "y", "w", "h",
+        "is_entrance", "entrance_side",
+        "connects_to", "preferred_sides",
+        "extra",
+    )
+    FIELDS = __slots__[:-1]
+
+    def __init__(self, name=None, type=None, zone=None, x=None, y=None, w=None, h=None,
+                 is_entrance=None, entrance_side=None, connects_to=None,
+                 preferred_sides=None, **extra):
+        self.name = name
+        self.type = type
+        self.zone = zone
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.is_entrance = is_entrance
+        self.entrance_side = entrance_side
+        # tuples: shared between copies, never mutated in place
+        self.connects_to = tuple(connects_to) if connects_to is not None else None
+        self.preferred_sides = tuple(preferred_sides) if preferred_sides is not None else None
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+    def copy(self):
+        r = Room.__new__(Room)
+        for f in Room.__slots__:
+            setattr(r, f, getattr(self, f))
+        if r.extra:
+            r.extra = dict(r.extra)
+        return r
+
+    def to_dict(self):
+        d = {}
+        for f in Room.FIELDS:
+            v = getattr(self, f)
+            if v is None:
+                continue
+            if f in ("connects_to", "preferred_sides"):
+                v = list(v)
+            d[f] = v
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    # ---- dict adapter ----
+
+    def __getitem__(self, key):
+        if key in Room.FIELDS:
+            v = getattr(self, key)
+            if v is not None:
+                if key in ("connects_to", "preferred_sides"):
+                    return list(v)
+                return v
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in Room.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def __iter__(self):
+        for f in Room.FIELDS:
+            if getattr(self, f) is not None:
+                yield f
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def __eq__(self, other):
+        if isinstance(other, Room):
+            return all(getattr(self, f) == getattr(other, f) for f in Room.__slots__)
+        if isinstance(other, Mapping):
+            # lists and tuples compare equal here, as to_dict() turns one into the other
+            return self.to_dict() == {
+                k: list(v) if isinstance(v, tuple) else v for k, v in other.items()
+            }
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Room({self.name!r}, {self.type!r}, x={self.x}, y={self.y}, w={self.w}, h={self.h})"
+
+
+Mapping.register(Room)
+
+
+def json_default(obj):
+    """`default=` for json.dump(s): encodes Rooms as to_dict()."""
+    if isinstance(obj, Room):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def as_room(r):
+    """Return `r` if it is already a Room, else a Room built from a dict."""
+    return r if isinstance(r, Room) else Room.from_dict(r)
+
+
+def as_rooms(rooms):
+    """
+    Adapter for public entry points: a list of Rooms, converting dicts.
+    A list that already holds only Rooms is returned as-is (no copy).
+    """
+    if not isinstance(rooms, list):
+        rooms = list(rooms)
+    if all(isinstance(r, Room) for r in rooms):
+        return rooms
+    return [as_room(r) for r in rooms]
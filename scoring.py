@@ -0,0 +1,73 @@
+import numpy as np
+
+from layout import layout_compactness_score, type_pair_score, zone_pair_score
+from room import as_rooms
+
+
+def room_arrays(rooms):
+    """Return x, y, w, h as float64 arrays (ROOM UNITS)."""
+    x = np.array([r.x for r in rooms], dtype=np.float64)
+    y = np.array([r.y for r in rooms], dtype=np.float64)
+    w = np.array([r.w for r in rooms], dtype=np.float64)
+    h = np.array([r.h for r in rooms], dtype=np.float64)
+    return x, y, w, h
+
+
+def contact_matrix(rooms):
+    """
+    Pairwise version of layout.touches(): C[i, j] is True when rooms i and j
+    share a wall segment of positive length.
+    """
+    x, y, w, h = room_arrays(rooms)
+    x2, y2 = x + w, y + h
+
+    x_edge = (x2[:, None] == x[None, :]) | (x2[None, :] == x[:, None])
+    y_edge = (y2[:, None] == y[None, :]) | (y2[None, :] == y[:, None])
+    x_overlap = np.maximum(x[:, None], x[None, :]) < np.minimum(x2[:, None], x2[None, :])
+    y_overlap = np.maximum(y[:, None], y[None, :]) < np.minimum(y2[:, None], y2[None, :])
+
+    # touches() checks the left/right case first and returns its answer
+    return np.where(x_edge, y_overlap, y_edge & x_overlap)
+
+
+def label_ids(values):
+    """Map arbitrary labels (None allowed) to dense ids. Returns (ids, labels)."""
+    index = {}
+    ids = np.array([index.setdefault(v, len(index)) for v in values], dtype=np.intp)
+    return ids, list(index)
+
+
+def weight_matrix(labels, pair_score):
+    k = len(labels)
+    W = np.zeros((k, k), dtype=np.int64)
+    for i in range(k):
+        for j in range(k):
+            W[i, j] = pair_score(labels[i], labels[j])
+    return W
+
+
+def adjacency_score(rooms, contacts=None):
+    """
+    Zone + type adjacency score from one contact matrix. Matches
+    layout_zone_adjacency_score(rooms) + layout_type_adjacency_score(rooms).
+    """
+    if len(rooms) < 2:
+        return 0
+    C = contact_matrix(rooms) if contacts is None else contacts
+
+    type_ids, types = label_ids(r.type for r in rooms)
+    zone_ids, zones = label_ids(r.zone for r in rooms)
+    TW = weight_matrix(types, type_pair_score)
+    ZW = weight_matrix(zones, zone_pair_score)
+
+    pair_w = TW[type_ids[:, None], type_ids[None, :]] + ZW[zone_ids[:, None], zone_ids[None, :]]
+    upper = np.triu(C, k=1)
+    return int(pair_w[upper].sum())
+
+
+def score_layout_np(rooms):
+    """
+    Same total as layout.score_layout, with contact detection done once.
+    """
+    rooms = as_rooms(rooms)
+    return adjacency_score(rooms) + layout_compactness_score(rooms)
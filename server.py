@@ -0,0 +1,335 @@
+"""
+Local HTTP blueprint service backed by a pool of warm worker processes.
+
+    python main.py --serve --port 8000 --workers 4
+
+Endpoints:
+  POST /generate  JSON body: {"prompt": "..."} or {"requirements": {...}},
+                  optional "seed", "attempts", "compact", "symbols".
+                  Returns {"requirements", "rooms", "score", "svg"}.
+  GET  /health    {"status": "ok" | "broken" | "stopped", "workers": n},
+                  503 unless ok
+  GET  /metrics   request counters and latency percentiles
+
+At most `workers + queue_size` requests are accepted at once; more get
+503 with Retry-After. "attempts" is capped at MAX_ATTEMPTS and each room
+count at MAX_ROOM_COUNT, so one request's work is bounded.
+
+A request that takes longer than `timeout` seconds gets 504. Workers are
+not killed (that would break the pool for every other request); instead
+each job gets a deadline of SEARCH_SHARE * timeout from submission and
+stops starting new layout attempts once it has passed, so a timed-out
+job frees its slot soon after. If a worker dies anyway, the broken pool
+is replaced.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from layout import generate_layout, search_layout
+from parser import as_requirements, parse_text
+from render_svg import draw_blueprint
+from templates import get_template
+
+MAX_BODY = 1 << 20
+LATENCY_WINDOW = 1000
+MAX_ATTEMPTS = 200
+MAX_ROOM_COUNT = 50
+MAX_SEATS = 10000
+ROOM_COUNT_KEYS = ("kitchen", "bathroom", "dining", "bedroom")
+# share of the request timeout the layout search may use (rest: queue, render)
+SEARCH_SHARE = 0.8
+
+
+def warm_worker():
+    """Pool initializer: run one tiny plan so imports and caches are hot."""
+    req = parse_text("1 bedroom house with 1 bathroom")
+    rooms = generate_layout(req, get_template(req["building_type"], req), seeds=[0])
+    draw_blueprint(rooms, backend="stream")
+
+
+def ping():
+    return os.getpid()
+
+
+def is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+
+def check_payload(payload, attempts=20):
+    """
+    Validate a POST /generate body. Returns (requirements, attempts);
+    raises ValueError for bad types or values over the caps.
+    """
+    if isinstance(payload.get("prompt"), str):
+        req = as_requirements(payload["prompt"])
+    elif isinstance(payload.get("requirements"), dict):
+        req = as_requirements(payload["requirements"])
+    else:
+        raise ValueError("need a prompt string or a requirements object")
+
+    if not isinstance(req.get("building_type"), str):
+        raise ValueError("bad building_type")
+    for key in ROOM_COUNT_KEYS:
+        if not is_int(req.get(key)) or not 0 <= req[key] <= MAX_ROOM_COUNT:
+            raise ValueError(f"bad {key}: need an integer from 0 to {MAX_ROOM_COUNT}")
+    if not is_int(req.get("seats")) or not 0 <= req["seats"] <= MAX_SEATS:
+        raise ValueError(f"bad seats: need an integer from 0 to {MAX_SEATS}")
+    width = req.get("total_width")
+    if width is not None and (isinstance(width, bool) or not isinstance(width, (int, float))):
+        raise ValueError("bad total_width")
+
+    n = payload.get("attempts", attempts)
+    if "attempts" in payload and (not is_int(n) or not 1 <= n <= MAX_ATTEMPTS):
+        raise ValueError(f"bad attempts: need an integer from 1 to {MAX_ATTEMPTS}")
+    seed = payload.get("seed")
+    if seed is not None and not is_int(seed):
+        raise ValueError("bad seed: need an integer")
+    return req, n
+
+
+def render_request(payload, attempts=20, deadline=None):
+    """
+    Worker side of POST /generate: requirements -> layout -> SVG.
+    Raises ValueError for a bad payload. `deadline` (time.time()) stops
+    the search early; at least one attempt always runs. A seeded request
+    that finishes all its attempts gets the same layout as
+    generate_layout with the seeds derived from that seed.
+    """
+    req, n = check_payload(payload, attempts)
+    template_rooms = get_template(req["building_type"], req)
+    budget = None if deadline is None else max(0.0, deadline - time.time())
+    result = search_layout(req, template_rooms, time_budget=budget, max_attempts=n,
+                           seed=payload.get("seed"))
+    rooms = result["rooms"]
+
+    svg = draw_blueprint(rooms, backend="stream", compact=bool(payload.get("compact")),
+                         symbols=bool(payload.get("symbols")))
+    return {
+        "requirements": req,
+        "rooms": [r.to_dict() for r in rooms],
+        "score": result["score"],
+        "attempts": result["attempts"],
+        "svg": svg.decode("utf-8"),
+    }
+
+
+class Busy(Exception):
+    pass
+
+
+class BlueprintService:
+    """
+    Worker pool plus admission control and metrics, independent of HTTP.
+    """
+
+    def __init__(self, workers=None, queue_size=None, timeout=30.0, attempts=20):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = self.workers if queue_size is None else queue_size
+        self.timeout = timeout
+        self.attempts = attempts
+        self.pool = None
+        self.slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self.lock = threading.Lock()
+        self.counters = {
+            "requests": 0, "ok": 0, "bad_request": 0, "errors": 0,
+            "rejected": 0, "timeouts": 0, "in_flight": 0, "pool_restarts": 0,
+        }
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def start(self):
+        """Start every worker process now, so no request pays for start-up."""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        for f in [self.pool.submit(ping) for _ in range(self.workers)]:
+            f.result()
+        return self
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def release(self, _future):
+        self.count("in_flight", -1)
+        self.slots.release()
+
+    def recover(self, pool):
+        """Replace `pool` after BrokenProcessPool (once, if threads race)."""
+        with self.lock:
+            if self.pool is not pool:
+                return
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+            self.counters["pool_restarts"] += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def health(self):
+        """"ok", "broken" (a worker died, BrokenProcessPool) or "stopped"."""
+        if self.pool is None:
+            return "stopped"
+        try:
+            self.pool.submit(ping)
+        except BrokenProcessPool:
+            return "broken"
+        except RuntimeError:  # shut down
+            return "stopped"
+        return "ok"
+
+    def generate(self, payload):
+        """
+        Run one request on the pool. Raises Busy if the queue is full,
+        TimeoutError past `timeout`, ValueError for a bad payload.
+        """
+        self.count("requests")
+        try:
+            check_payload(payload, self.attempts)  # before it takes a slot
+        except ValueError:
+            self.count("bad_request")
+            raise
+        if not self.slots.acquire(blocking=False):
+            self.count("rejected")
+            raise Busy()
+        self.count("in_flight")
+
+        start = time.perf_counter()
+        pool = self.pool
+        deadline = time.time() + self.timeout * SEARCH_SHARE
+        try:
+            future = pool.submit(render_request, payload, self.attempts, deadline)
+        except Exception as e:  # BrokenProcessPool, or shut down
+            self.release(None)
+            self.count("errors")
+            if isinstance(e, BrokenProcessPool):
+                self.recover(pool)
+            raise
+        future.add_done_callback(self.release)
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()  # only helps if it has not started yet
+            self.count("timeouts")
+            raise
+        except ValueError:
+            self.count("bad_request")
+            raise
+        except BrokenProcessPool:
+            self.count("errors")
+            self.recover(pool)
+            raise
+        except Exception:
+            self.count("errors")
+            raise
+
+        with self.lock:
+            self.counters["ok"] += 1
+            self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            counters = dict(self.counters)
+
+        def pct(q):
+            if not latencies:
+                return None
+            k = max(0, min(len(latencies) - 1, int(round(q / 100 * len(latencies))) - 1))
+            return round(latencies[k] * 1000, 3)
+
+        return dict(counters, workers=self.workers, queue_size=self.queue_size,
+                    latency_p50_ms=pct(50), latency_p99_ms=pct(99))
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "blueprint/1"
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/health":
+            status = service.health()
+            self.send_json(200 if status == "ok" else 503,
+                           {"status": status, "workers": service.workers})
+        elif self.path == "/metrics":
+            self.send_json(200, service.metrics())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.send_json(413, {"error": "body too large"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            self.send_json(400, {"error": f"bad json: {e}"})
+            return
+        if not isinstance(payload, dict):
+            self.send_json(400, {"error": "body must be a JSON object"})
+            return
+
+        service = self.server.service
+        try:
+            result = service.generate(payload)
+        except Busy:
+            self.send_json(503, {"error": "busy"}, headers=[("Retry-After", "1")])
+        except TimeoutError:
+            self.send_json(504, {"error": f"timed out after {service.timeout}s"})
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self.send_json(200, result)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8000, quiet=False, **service_options):
+    """
+    HTTP server with a started BlueprintService attached (server.service).
+    Call serve_forever(); shut down with shutdown() then service.close().
+    port=0 picks a free port (see server.server_address).
+    """
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    server.service = BlueprintService(**service_options).start()
+    return server
+
+
+def serve(host="127.0.0.1", port=8000, **service_options):
+    server = make_server(host, port, **service_options)
+    print(f"Serving blueprints on http://{host}:{server.server_address[1]} "
+          f"({server.service.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
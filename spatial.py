@@ -0,0 +1,89 @@
+import math
+
+from constraints import rect_fits
+
+
+class SpatialGrid:
+    """
+    Uniform grid over room extents (in ROOM UNITS).
+
+    Every room is registered in each cell its rectangle covers, so an
+    overlap query only has to look at the rooms sharing a cell with the
+    candidate instead of every placed room.
+    """
+
+    def __init__(self, cell_size=16):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _cell_range(self, x, y, w, h):
+        c = self.cell_size
+        x0 = math.floor(x / c)
+        y0 = math.floor(y / c)
+        # right/bottom edges are exclusive: a room ending exactly on a
+        # cell border does not occupy the next cell
+        x1 = math.ceil((x + w) / c) - 1
+        y1 = math.ceil((y + h) / c) - 1
+        for cx in range(x0, max(x0, x1) + 1):
+            for cy in range(y0, max(y0, y1) + 1):
+                yield cx, cy
+
+    def add(self, room):
+        for key in self._cell_range(room.x, room.y, room.w, room.h):
+            self.cells.setdefault(key, []).append(room)
+
+    def remove(self, room):
+        for key in self._cell_range(room.x, room.y, room.w, room.h):
+            bucket = self.cells.get(key)
+            if not bucket:
+                continue
+            bucket[:] = [r for r in bucket if r is not room]
+            if not bucket:
+                del self.cells[key]
+
+    def near(self, x, y, w, h):
+        """
+        Return the rooms sharing at least one cell with the given rectangle.
+        """
+        seen = set()
+        found = []
+        for key in self._cell_range(x, y, w, h):
+            for r in self.cells.get(key, ()):
+                if id(r) not in seen:
+                    seen.add(id(r))
+                    found.append(r)
+        return found
+
+    def fits(self, x, y, w, h, stats=None):
+        """
+        True if a w*h rectangle at (x, y) overlaps none of the indexed rooms.
+        `stats` counts the nearby rooms compared as "pairs_compared".
+        """
+        if stats is not None:
+            return rect_fits(self.near(x, y, w, h), x, y, w, h, stats)
+        for b in self.near(x, y, w, h):
+            if not (
+                x + w <= b.x or
+                b.x + b.w <= x or
+                y + h <= b.y or
+                b.y + b.h <= y
+            ):
+                return False
+        return True
+
+    def first_fit(self, positions, w, h, stats=None):
+        """
+        Return the first (x, y) from `positions` where a w*h room fits,
+        or None.
+        """
+        for x, y in positions:
+            if self.fits(x, y, w, h, stats):
+                return x, y
+        return None
+
+
+def build_grid(rooms, cell_size=16):
+    grid = SpatialGrid(cell_size)
+    for r in rooms:
+        grid.add(r)
+    return grid
@@ -0,0 +1,74 @@
+import json
+import logging
+import time
+
+
+class SearchStats:
+    """
+    Optional statistics for generate_layout / draw_blueprint. Pass one as
+    `stats=`; without it (the default) nothing is timed or counted.
+
+    timings:  seconds per phase ("placement", "corridors", "scoring",
+              "refine", "rendering", "generate", ...)
+    counters: "attempts", "attempts_pruned", "attempts_rejected" (broke a
+              hard constraint), "attempts_won" (attempts that
+              became the best so far), "best_attempt" (0-based index of
+              the winner), "candidates" (positions generated for
+              placement, before constraint filtering), "overlap_checks"
+              (candidate positions tested against the placed rooms, up
+              to the first fit), "pairs_compared" (room-vs-room rectangle
+              tests made by those checks; the raster backend compares
+              cells instead, so it adds none),
+              "interval_scans" (anchor sides whose free intervals were
+              computed, candidates="interval"; those candidates need no
+              overlap checks), "fallback_pack", "alternatives" (layouts
+              returned with top_k), "openings" (door openings cut into
+              the walls, entrance included)
+
+    Values accumulate over every call the object is passed to. `hook`,
+    if given, is called with record() (a plain dict) each time a call
+    finishes; see logging_hook.
+    """
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.timings = {}
+        self.counters = {}
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def merge(self, other):
+        """Add the timings and counters of another SearchStats (e.g. from a worker)."""
+        for phase, seconds in other.timings.items():
+            self.add_time(phase, seconds)
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def record(self, event=None):
+        return {
+            "event": event,
+            "time": time.time(),
+            "timings": dict(self.timings),
+            "counters": dict(self.counters),
+        }
+
+    def emit(self, event):
+        if self.hook is not None:
+            self.hook(self.record(event))
+
+    def __getstate__(self):
+        # hooks (loggers, closures) stay in the parent process
+        return {"hook": None, "timings": self.timings, "counters": self.counters}
+
+
+def logging_hook(logger=None, level=logging.INFO):
+    """Hook that logs each record as one JSON line."""
+    logger = logger or logging.getLogger("blueprint.stats")
+
+    def hook(record):
+        logger.log(level, json.dumps(record, sort_keys=True))
+    return hook
@@ -0,0 +1,134 @@
+"""
+Minimal streaming SVG writer.
+
+Implements the part of the svgwrite.Drawing API that render_svg uses
+(add, defs, rect / line / path / text / g / symbol / use / style) but
+writes each top-level element straight to a text file object instead of
+building an element tree, and skips attribute validation. The bytes
+written match what svgwrite produces for the same calls (attributes
+sorted by name, numbers via str(), etree escaping).
+"""
+
+XML_HEADER = '<?xml version="1.0" encoding="utf-8" ?>\n'
+
+SVG_ATTRIBS = {
+    "baseProfile": "full",
+    "version": "1.1",
+    "xmlns": "http://www.w3.org/2000/svg",
+    "xmlns:ev": "http://www.w3.org/2001/xml-events",
+    "xmlns:xlink": "http://www.w3.org/1999/xlink",
+}
+
+
+def escape_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escape_attrib(text):
+    text = escape_text(text).replace('"', "&quot;")
+    if "\r" in text or "\n" in text or "\t" in text:
+        text = text.replace("\r", "&#13;").replace("\n", "&#10;").replace("\t", "&#09;")
+    return text
+
+
+def element(name, attribs, text=None):
+    """
+    Serialize one element. Keyword-style names (stroke_width) become SVG
+    names (stroke-width); None and empty values are dropped, like svgwrite.
+    """
+    parts = ["<", name]
+    for key, value in sorted((k.rstrip("_").replace("_", "-"), v) for k, v in attribs.items()):
+        if value is None:
+            continue
+        value = str(value)
+        if value:
+            parts.append(f' {key}="{escape_attrib(value)}"')
+    if text:
+        parts.append(f">{escape_text(text)}</{name}>")
+    else:
+        parts.append(" />")
+    return "".join(parts)
+
+
+class Container:
+    """
+    Element with children (g, symbol, defs). Children are serialized
+    strings; str() gives the whole element.
+    """
+
+    def __init__(self, name, attribs=None):
+        self.name = name
+        self.attribs = attribs or {}
+        self.children = []
+
+    def add(self, elem):
+        self.children.append(str(elem))
+        return elem
+
+    def __str__(self):
+        start = element(self.name, self.attribs)
+        if not self.children:
+            return start
+        return f"{start[:-3]}>{''.join(self.children)}</{self.name}>"
+
+
+class SvgStream:
+    """
+    Writes the XML header, the <svg> start tag and <defs> on the first
+    add(), then each element as it is added, and the end tag on close().
+    Everything for `defs` must therefore be added before the first add().
+    `out` is a text file object.
+    """
+
+    def __init__(self, out, size):
+        self.out = out
+        width, height = size
+        self.attribs = dict(SVG_ATTRIBS, width=width, height=height)
+        self.defs = Container("defs")
+        self.started = False
+
+    def start(self):
+        self.started = True
+        self.out.write(XML_HEADER)
+        self.out.write(element("svg", self.attribs)[:-3] + ">" + str(self.defs))
+
+    def add(self, elem):
+        if not self.started:
+            self.start()
+        self.out.write(str(elem))
+        return elem
+
+    def rect(self, insert=(0, 0), size=(1, 1), **extra):
+        return element("rect", dict(extra, x=insert[0], y=insert[1], width=size[0], height=size[1]))
+
+    def line(self, start=(0, 0), end=(0, 0), **extra):
+        return element("line", dict(extra, x1=start[0], y1=start[1], x2=end[0], y2=end[1]))
+
+    def path(self, d=None, **extra):
+        return element("path", dict(extra, d=d))
+
+    def text(self, text, insert=None, **extra):
+        if insert is not None:
+            extra = dict(extra, x=insert[0], y=insert[1])
+        return element("text", extra, None if text is None else str(text))
+
+    def g(self, **extra):
+        return Container("g", extra)
+
+    def symbol(self, **extra):
+        return Container("symbol", extra)
+
+    def use(self, href, insert=None, **extra):
+        if isinstance(href, Container):
+            href = "#" + href.attribs["id"]
+        if insert is not None:
+            extra = dict(extra, x=insert[0], y=insert[1])
+        return element("use", dict(extra, **{"xlink:href": href}))
+
+    def style(self, content):
+        return f'<style type="text/css"><![CDATA[{content}]]></style>'
+
+    def close(self):
+        if not self.started:
+            self.start()
+        self.out.write("</svg>")
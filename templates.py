@@ -1,3 +1,5 @@
+from room import Room
+
 def restaurant_template(requirements):
     #use requirements later to scale sizes (seats -> dining area, etc.)
     baths = requirements.get("bathroom", 0)
@@ -5,36 +7,36 @@ def restaurant_template(requirements):
 
     rooms = []
 
-    rooms.append({
-        "name": "Dining",
-        "type": "dining",
-        "zone": "public",
-        "w": 30, "h": 20,
-        "is_entrance": True,
-        "entrance_side": "top",
-        "connects_to": ["kitchen", "bathroom"],
-        "preferred_sides": ["right", "bottom", "left", "top"],
-    })
+    rooms.append(Room(
+        name="Dining",
+        type="dining",
+        zone="public",
+        w=30, h=20,
+        is_entrance=True,
+        entrance_side="top",
+        connects_to=["kitchen", "bathroom"],
+        preferred_sides=["right", "bottom", "left", "top"],
+    ))
 
     if has_kitchen:
-        rooms.append({
-            "name": "Kitchen",
-            "type": "kitchen",
-            "zone": "service",
-            "w": 15, "h": 20,
-            "connects_to": ["dining"],
-            "preferred_sides": ["left", "top", "bottom", "right"],
-        })
+        rooms.append(Room(
+            name="Kitchen",
+            type="kitchen",
+            zone="service",
+            w=15, h=20,
+            connects_to=["dining"],
+            preferred_sides=["left", "top", "bottom", "right"],
+        ))
     
     for i in range(baths):
-        rooms.append({
-            "name": f"Bathroom {i+1}",
-            "type": "bathroom",
-            "zone": "public",
-            "w": 10, "h": 8,
-            "connects_to": ["dining"],
-            "preferred_sides": ["top", "left", "right", "bottom"],
-        })
+        rooms.append(Room(
+            name=f"Bathroom {i+1}",
+            type="bathroom",
+            zone="public",
+            w=10, h=8,
+            connects_to=["dining"],
+            preferred_sides=["top", "left", "right", "bottom"],
+        ))
     return rooms
 
 def house_template(requirements):
@@ -43,64 +45,64 @@ def house_template(requirements):
 
     rooms = []
 
-    rooms.append({
-        "name": "Living",
-        "type": "living",
-        "zone": "public",
-        "w": 24, "h": 18,
-        "is_entrance": True,
-        "entrance_side": "bottom",   # common “front door” at bottom in your drawings
-        "connects_to": ["kitchen", "hall"],
-        "preferred_sides": ["right", "top", "left", "bottom"],
-    })
+    rooms.append(Room(
+        name="Living",
+        type="living",
+        zone="public",
+        w=24, h=18,
+        is_entrance=True,
+        entrance_side="bottom",   # common “front door” at bottom in your drawings
+        connects_to=["kitchen", "hall"],
+        preferred_sides=["right", "top", "left", "bottom"],
+    ))
 
-    rooms.append({
-        "name": "Kitchen",
-        "type": "kitchen",
-        "zone": "service",
-        "w": 16, "h": 12,
-        "connects_to": ["living", "dining"],
-        "preferred_sides": ["left", "top", "right", "bottom"],
-    })
+    rooms.append(Room(
+        name="Kitchen",
+        type="kitchen",
+        zone="service",
+        w=16, h=12,
+        connects_to=["living", "dining"],
+        preferred_sides=["left", "top", "right", "bottom"],
+    ))
 
-    rooms.append({
-        "name": "Dining",
-        "type": "dining",
-        "zone": "public",
-        "w": 14, "h": 12,
-        "connects_to": ["kitchen", "living"],
-        "preferred_sides": ["left", "bottom", "top", "right"],
-    })
+    rooms.append(Room(
+        name="Dining",
+        type="dining",
+        zone="public",
+        w=14, h=12,
+        connects_to=["kitchen", "living"],
+        preferred_sides=["left", "bottom", "top", "right"],
+    ))
 
     # Simple hallway to connect private rooms (v1 house needs this or layouts get awkward)
-    rooms.append({
-        "name": "Hall",
-        "type": "hall",
-        "zone": "circulation",
-        "w": 6, "h": 18,
-        "connects_to": ["living", "bedroom", "bathroom"],
-        "preferred_sides": ["top", "right", "left", "bottom"],
-    })
+    rooms.append(Room(
+        name="Hall",
+        type="hall",
+        zone="circulation",
+        w=6, h=18,
+        connects_to=["living", "bedroom", "bathroom"],
+        preferred_sides=["top", "right", "left", "bottom"],
+    ))
 
     for i in range(beds):
-        rooms.append({
-            "name" : f"Bedroom {i+1}",
-            "type" : "bedroom",
-            "zone" : "private",
-            "w" : 14, "h" : 12,
-            "connects_to" : ["hall"],
-            "preferred_sides": ["left", "right", "top", "bottom"],
-        })
+        rooms.append(Room(
+            name=f"Bedroom {i+1}",
+            type="bedroom",
+            zone="private",
+            w=14, h=12,
+            connects_to=["hall"],
+            preferred_sides=["left", "right", "top", "bottom"],
+        ))
 
     for i in range(baths):
-        rooms.append({
-            "name": f"Bathroom {i+1}",
-            "type": "bathroom",
-            "zone": "private",
-            "w": 10, "h": 8,
-            "connects_to": ["hall"],
-            "preferred_sides": ["top", "left", "right", "bottom"],
-        })
+        rooms.append(Room(
+            name=f"Bathroom {i+1}",
+            type="bathroom",
+            zone="private",
+            w=10, h=8,
+            connects_to=["hall"],
+            preferred_sides=["top", "left", "right", "bottom"],
+        ))
 
     return rooms
 
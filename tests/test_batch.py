@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import render_svg
+from batch import run_batch
+from layout import generate_layout
+from parser import parse_text
+from render_svg import draw_blueprint
+from templates import get_template
+
+
+def write_jobs(path, jobs):
+    path.write_text("".join(json.dumps(job) + "\n" for job in jobs), encoding="utf-8")
+
+
+def read_results(path):
+    return {r["id"]: r for r in map(json.loads, path.read_text(encoding="utf-8").splitlines())}
+
+
+def test_batch_rejects_bad_jobs(tmp_path):
+    jobs = tmp_path / "jobs.jsonl"
+    write_jobs(jobs, [
+        {"id": "a", "prompt": "2 bedroom house", "seed": 1, "attempts": 2},
+        {"id": "a", "prompt": "cafe", "seed": 1, "attempts": 2},
+        {"id": "b", "prompt": "cafe", "attempts": 0},
+        {"id": "c", "prompt": "cafe", "attempts": "5"},
+        {"id": "d", "prompt": "cafe", "seed": [1]},
+    ])
+    out = tmp_path / "out"
+    assert run_batch(str(jobs), str(out), workers=0) == (1, 4)
+
+    lines = (out / "results.jsonl").read_text(encoding="utf-8").splitlines()
+    first, duplicate = [json.loads(line) for line in lines if json.loads(line)["id"] == "a"]
+    assert first["svg"].endswith("a.svg") and "error" not in first
+    assert duplicate["error"].startswith("duplicate id")
+    results = read_results(out / "results.jsonl")
+    assert results["b"]["error"].startswith("ValueError: bad attempts")
+    assert results["c"]["error"].startswith("ValueError: bad attempts")
+    assert results["d"]["error"].startswith("ValueError: bad seed")
+
+
+def test_failed_render_keeps_the_old_file(tmp_path, monkeypatch):
+    req = parse_text("2 bedroom house")
+    rooms = generate_layout(req, get_template(req["building_type"], req), seeds=[1])
+    for name in ("plan.svg", "plan.svgz"):
+        target = tmp_path / name
+        draw_blueprint(rooms, str(target))
+        before = target.read_bytes()
+
+        def broken(rooms, out, backend, **options):
+            out.write("<svg")
+            raise RuntimeError("render failed")
+
+        with monkeypatch.context() as m:
+            m.setattr(render_svg, "render_blueprint", broken)
+            with pytest.raises(RuntimeError):
+                draw_blueprint(rooms, str(target))
+        assert target.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["plan.svg", "plan.svgz"]
@@ -0,0 +1,79 @@
+import os
+import random
+
+import pytest
+
+from cache import LayoutCache, cached_layout, canonical_key
+from constraints import MaxFootprint
+from parser import parse_text
+from stats import SearchStats
+from templates import get_template
+
+
+def plan(text="3 bedroom house with 2 bathrooms"):
+    req = parse_text(text)
+    return req, get_template(req["building_type"], req)
+
+
+def test_key_is_stable():
+    req, template = plan()
+    options = {"attempts": 20, "seed": 1}
+    assert canonical_key(req, template, options) == canonical_key(req, template, dict(options))
+
+
+def test_key_depends_on_layout_options():
+    req, template = plan()
+    base = canonical_key(req, template, {"attempts": 20, "seed": 1})
+    assert canonical_key(req, template, {"attempts": 20, "seed": 2}) != base
+    assert canonical_key(req, template, {"attempts": 21, "seed": 1}) != base
+    assert canonical_key(req, template, {"attempts": 20, "seed": 1, "prune": True}) != base
+    other_req, other_template = plan("2 bedroom house with 2 bathrooms")
+    assert canonical_key(other_req, other_template, {"attempts": 20, "seed": 1}) != base
+
+
+def test_key_ignores_execution_options():
+    req, template = plan()
+    base = canonical_key(req, template, {"attempts": 20, "seed": 1})
+    for extra in ({"workers": 4}, {"scorer": "numpy"}, {"stats": SearchStats()}):
+        assert canonical_key(req, template, dict(extra, attempts=20, seed=1)) == base
+
+
+def test_key_includes_constraints():
+    req, template = plan()
+    keys = {
+        canonical_key(req, template, {"constraints": [MaxFootprint(width=w)]})
+        for w in (40, 50)
+    }
+    assert len(keys) == 2
+
+
+def test_key_rejects_an_rng():
+    req, template = plan()
+    with pytest.raises(ValueError):
+        canonical_key(req, template, {"refine": {"rng": random.Random(1)}})
+
+
+def test_cached_layout_matches_a_fresh_run(tmp_path):
+    cache = LayoutCache(directory=str(tmp_path))
+    first = cached_layout("2 bedroom house", cache, attempts=3, seed=5)
+    again = cached_layout("2 bedroom house", cache, attempts=3, seed=5)
+    assert again == first
+    assert cache.stats()["hits"] == 1
+
+    # a new cache over the same directory is served from disk
+    other = LayoutCache(directory=str(tmp_path))
+    assert cached_layout("2 bedroom house", other, attempts=3, seed=5) == first
+    assert other.stats()["disk_hits"] == 1
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(directory) for f in files)
+
+
+def test_disk_tier_is_capped(tmp_path):
+    cache = LayoutCache(directory=str(tmp_path), max_disk_bytes=6000)
+    for seed in range(12):
+        cached_layout("3 bedroom house", cache, attempts=2, seed=seed)
+    assert 0 < disk_bytes(tmp_path) <= 6000
+    assert cache.stats()["disk_bytes"] == disk_bytes(tmp_path)
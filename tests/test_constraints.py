@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from constraints import ExteriorAccess, MaxFootprint, RequiredAdjacency, compile_constraints
+from layout import generate_layout
+from parser import parse_text
+from templates import get_template
+
+
+def plan(text="3 bedroom house with 2 bathrooms"):
+    req = parse_text(text)
+    return req, get_template(req["building_type"], req)
+
+
+def width(rooms):
+    return max(r.x + r.w for r in rooms) - min(r.x for r in rooms)
+
+
+def test_layout_satisfies_constraints():
+    req, template = plan()
+    rooms = generate_layout(req, template, seeds=range(10), constraints=[MaxFootprint(width=60)])
+    assert width(rooms) <= 60
+
+
+def test_auto_constraints():
+    req, template = plan()
+    rooms = generate_layout(req, template, seeds=range(10), constraints="auto")
+    engine = compile_constraints("auto", template, req)
+    assert engine.satisfied(rooms)
+
+
+def test_unsatisfiable_raises():
+    req, template = plan()
+    with pytest.raises(ValueError):
+        generate_layout(req, template, seeds=range(3), constraints=[MaxFootprint(width=5)])
+
+
+def test_large_plan_checks_constraints():
+    req, template = plan()
+    with pytest.raises(ValueError):
+        generate_layout(req, template, large_plan=True, constraints=[MaxFootprint(width=5)])
+    rooms = generate_layout(req, template, large_plan=True, constraints=[ExteriorAccess()])
+    assert ExteriorAccess().satisfied(rooms)
+
+
+def test_compile_does_not_mutate():
+    req, template = plan()
+    adjacency = RequiredAdjacency("bedroom", "hall")
+    footprint = MaxFootprint(width=60)
+    before = (vars(adjacency).copy(), vars(footprint).copy())
+    engine = compile_constraints([adjacency, footprint], template)
+    assert (vars(adjacency), vars(footprint)) == before
+    assert all(c is not adjacency and c is not footprint for c in engine.constraints)
+
+
+def test_constraints_that_cannot_apply_are_dropped():
+    _, template = plan("restaurant with 2 bathrooms")
+    assert compile_constraints([RequiredAdjacency("bedroom", "hall"), MaxFootprint()],
+                               template) is None
+
+
+def test_thread_pool_is_deterministic():
+    req, template = plan()
+    constraints = [MaxFootprint(width=60), ExteriorAccess()]
+    serial = generate_layout(req, template, seeds=range(8), constraints=constraints)
+    with ThreadPoolExecutor(4) as pool:
+        threaded = generate_layout(req, template, seeds=range(8), constraints=constraints,
+                                   executor=pool)
+    assert [r.to_dict() for r in threaded] == [r.to_dict() for r in serial]
@@ -0,0 +1,70 @@
+import pytest
+
+from parser import number_before, parse_text
+
+
+def counts(text):
+    spec = parse_text(text)
+    return spec["building_type"], spec["bedroom"], spec["bathroom"], spec["seats"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3 bedroom house with 2 bathrooms", ("house", 3, 2, 0)),
+    ("3bedroom house", ("house", 3, 0, 0)),
+    ("three bedroom house with two bathrooms", ("house", 3, 2, 0)),
+    ("twenty one bedroom house", ("house", 21, 0, 0)),
+    ("twenty-one bedroom house", ("house", 21, 0, 0)),
+    ("seventy seats", ("restaurant", 0, 0, 70)),
+])
+def test_numbers(text, expected):
+    assert counts(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("two-bedroom house", ("house", 2, 0, 0)),
+    ("3-bedroom house", ("house", 3, 0, 0)),
+    ("house with a three - bedroom plan", ("house", 3, 0, 0)),
+    ("cafe with a two-bathroom block", ("restaurant", 0, 2, 0)),
+])
+def test_hyphenated(text, expected):
+    assert counts(text) == expected
+
+
+@pytest.mark.parametrize("text, seats", [
+    ("one hundred seats", 100),
+    ("restaurant with a hundred seats", 100),
+    ("restaurant with a hundred and twenty seats", 120),
+    ("cafe with one hundred and five seats", 105),
+    ("nine hundred and ninety-nine seats", 999),
+])
+def test_hundreds(text, seats):
+    assert parse_text(text)["seats"] == seats
+
+
+@pytest.mark.parametrize("text", [
+    "house with a bedroom",
+    "kitchen and bedroom house",
+    "guestbedroom house",
+    "often bedroom house",
+])
+def test_no_number_counts_one(text):
+    assert parse_text(text)["bedroom"] == 1
+
+
+def test_first_count_wins():
+    assert parse_text("2 bedroom house, 5 bedroom guest wing")["bedroom"] == 2
+
+
+def test_kitchen_is_a_flag():
+    assert parse_text("restaurant with 3 kitchens")["kitchen"] == 1
+
+
+def test_number_before_absent():
+    assert number_before("bedroom", 0) is None
+    assert number_before("and bedroom", 4) is None
+
+
+def test_long_prefix_is_not_misread():
+    # the lookback window cuts "often" to "ten"; that is not a count
+    text = "often" + " " * 45 + "bedroom"
+    assert number_before(text, text.index("bedroom")) is None
@@ -0,0 +1,94 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from layout import generate_layout
+from parser import parse_text
+from room import Room, as_rooms, json_default
+from templates import get_template
+
+TEMPLATE = {
+    "name": "Living",
+    "type": "living",
+    "zone": "public",
+    "w": 24, "h": 18,
+    "is_entrance": True,
+    "entrance_side": "bottom",
+    "connects_to": ["kitchen", "hall"],
+    "preferred_sides": ["right", "top", "left", "bottom"],
+}
+
+
+def test_round_trip_keeps_missing_keys_absent():
+    room = Room.from_dict(TEMPLATE)
+    assert room == TEMPLATE
+    assert dict(room) == TEMPLATE
+    assert room.to_dict() == TEMPLATE
+    assert "x" not in room
+    assert room.get("x", "unset") == "unset"
+
+    bare = {"name": "Hall", "type": "hall"}
+    assert Room.from_dict(bare) == bare
+    assert len(Room.from_dict(bare)) == 2
+
+
+def test_mapping_view_returns_lists():
+    room = Room.from_dict(TEMPLATE)
+    assert room["connects_to"] == ["kitchen", "hall"]
+    assert isinstance(room["connects_to"], list)
+    assert isinstance(dict(room)["preferred_sides"], list)
+    room["connects_to"].append("dining")  # a copy; the room is unchanged
+    assert room.connects_to == ("kitchen", "hall")
+
+
+def test_dict_style_access():
+    room = Room.from_dict(dict(TEMPLATE, label="L1"))
+    assert room["label"] == "L1"
+    assert room.get("zone", "private") == "public"
+    room["x"] = 3
+    assert room.x == 3 and room["x"] == 3
+    assert room.setdefault("y", 4) == 4 and room.y == 4
+    with pytest.raises(KeyError):
+        room["missing"]
+
+
+def test_equality_with_room_and_dict():
+    a = Room.from_dict(TEMPLATE)
+    b = a.copy()
+    assert a == b
+    b.x = 1
+    assert a != b
+    assert a == dict(TEMPLATE, connects_to=("kitchen", "hall"))
+
+
+def test_copies_are_independent():
+    room = Room.from_dict(dict(TEMPLATE, label="L1"))
+    for clone in (room.copy(), copy.deepcopy(room), pickle.loads(pickle.dumps(room))):
+        assert clone == room
+        clone["label"] = "L2"
+        assert room["label"] == "L1"
+
+
+def test_as_rooms_accepts_dicts_and_rooms():
+    rooms = [Room.from_dict(TEMPLATE)]
+    assert as_rooms(rooms) is rooms
+    converted = as_rooms([TEMPLATE])
+    assert isinstance(converted[0], Room) and converted[0] == TEMPLATE
+
+
+def test_generate_layout_accepts_dict_templates():
+    req = parse_text("2 bedroom house")
+    template = get_template(req["building_type"], req)
+    from_dicts = generate_layout(req, [r.to_dict() for r in template], seeds=[1, 2])
+    assert from_dicts == generate_layout(req, template, seeds=[1, 2])
+    assert all("x" in r and "y" in r for r in from_dicts)
+
+
+def test_layout_serializes_to_json():
+    req = parse_text("2 bedroom house")
+    rooms = generate_layout(req, get_template(req["building_type"], req), seeds=[1])
+    data = json.loads(json.dumps(rooms, default=json_default))
+    assert data == [r.to_dict() for r in rooms]
+    assert [Room.from_dict(d) for d in data] == rooms
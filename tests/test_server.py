@@ -0,0 +1,79 @@
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from server import MAX_ATTEMPTS, MAX_ROOM_COUNT, BlueprintService, Busy, check_payload, ping
+
+
+def test_check_payload_defaults():
+    req, n = check_payload({"prompt": "2 bedroom house"}, attempts=7)
+    assert req["bedroom"] == 2
+    assert n == 7
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"prompt": 3},
+    {"requirements": "house"},
+    {"prompt": "house", "attempts": None},
+    {"prompt": "house", "attempts": 0},
+    {"prompt": "house", "attempts": MAX_ATTEMPTS + 1},
+    {"prompt": "house", "attempts": True},
+    {"prompt": "house", "attempts": 2.0},
+    {"prompt": "house", "seed": "1"},
+    {"requirements": {"building_type": "house", "bedroom": MAX_ROOM_COUNT + 1}},
+    {"requirements": {"building_type": "house", "bathroom": -1}},
+    {"requirements": {"building_type": 1}},
+    {"requirements": {"building_type": "house", "total_width": "60"}},
+])
+def test_check_payload_rejects(payload):
+    with pytest.raises(ValueError):
+        check_payload(payload)
+
+
+def test_bad_request_takes_no_slot():
+    service = BlueprintService(workers=1, queue_size=0)
+    with pytest.raises(ValueError):
+        service.generate({"prompt": "house", "attempts": None})
+    assert service.counters["bad_request"] == 1
+    assert service.counters["in_flight"] == 0
+    assert service.slots.acquire(blocking=False)
+
+
+def test_busy_when_slots_are_taken():
+    service = BlueprintService(workers=1, queue_size=0)
+    service.slots.acquire()
+    with pytest.raises(Busy):
+        service.generate({"prompt": "1 bedroom house"})
+    assert service.counters["rejected"] == 1
+    assert service.counters["in_flight"] == 0
+
+
+def test_health_without_pool():
+    service = BlueprintService(workers=1)
+    assert service.health() == "stopped"
+
+
+def test_dead_worker_replaces_the_pool():
+    service = BlueprintService(workers=1, queue_size=0, timeout=30).start()
+    try:
+        assert service.health() == "ok"
+        os.kill(service.pool.submit(ping).result(), signal.SIGKILL)
+        time.sleep(0.2)
+        payload = {"prompt": "1 bedroom house", "seed": 1, "attempts": 2}
+        with pytest.raises(BrokenProcessPool):
+            service.generate(payload)
+        assert service.counters["errors"] == 1
+        assert service.counters["pool_restarts"] == 1
+        assert service.counters["in_flight"] == 0
+
+        result = service.generate(payload)
+        assert result["attempts"] == 2
+        assert service.health() == "ok"
+        assert service.counters["in_flight"] == 0
+    finally:
+        service.close()
+    assert service.health() == "stopped"